@@ -1,12 +1,27 @@
 from flask import Flask, send_from_directory, request
 from flask_cors import CORS
-from sqlalchemy import create_engine, text
-from sqlalchemy_utils import database_exists, create_database
-from sqlalchemy.pool import NullPool
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool, QueuePool
 from dotenv import load_dotenv
 from flask_jwt_extended import JWTManager
+from werkzeug.serving import is_running_from_reloader
 from datetime import timedelta
 import os
+from utils.migrations import apply_migrations, check_schema_version, ensure_database
+from utils.jobs import start_job_workers, run_worker_forever
+from utils.query_timing import init_request_timing, instrument_engine
+from utils.metrics import init_request_metrics, instrument_pool
+from utils.serialization import FastJSONProvider
+from utils.compression import init_compression
+from utils.static_files import StaticIndex
+from utils.storage import LOCAL_STORAGE_ROOT, LOCAL_STORAGE_URL
+from routes.student_routes import init_student_routes
+from routes.college_routes import init_college_routes
+from routes.program_routes import init_program_routes
+from routes.authentication_routes import init_auth_routes
+from routes.health_routes import init_health_routes
+from routes.stats_routes import init_stats_routes
+from routes.metrics_routes import init_metrics_routes
 
 
 load_dotenv()
@@ -19,120 +34,183 @@ DBNAME = os.getenv("dbname")
 
 DATABASE_URL = f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}"
 
+# Connection Pool Configuration
+# DB_POOL_MODE=null opens a fresh connection per checkout (useful behind an
+# external pooler such as PgBouncer / Supabase pooler in transaction mode).
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "queue").lower()
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", "0"))
+
 # Path to the React build folder
 FRONTEND_BUILD_PATH = os.path.join(os.path.dirname(__file__), 'static')
 
-app = Flask(__name__, static_folder=FRONTEND_BUILD_PATH, static_url_path='')
-
-
-CORS(
-    app,
-    supports_credentials=True,
-    origins=["http://localhost:3000", "http://localhost:5000", "http://127.0.0.1:5000"],
-    allow_headers=["Content-Type", "Authorization"],
-    methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"]
-)
-
-
-# JWT Configuration
-app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
-app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY")
-app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=1)
-
-jwt = JWTManager(app)
+# Engine Factory
+def create_db_engine():
+    """Create the shared engine using the configured pool mode"""
+    if DB_POOL_MODE == "null":
+        return create_engine(DATABASE_URL, poolclass=NullPool)
+
+    return create_engine(
+        DATABASE_URL,
+        poolclass=QueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+
+def warm_up_pool(engine, count):
+    """Open `count` connections up front so the first requests skip connection setup"""
+    count = min(count, DB_POOL_SIZE)
+    if DB_POOL_MODE == "null" or count <= 0:
+        return
+
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        # Returning them checks them back into the pool as idle connections
+        for conn in connections:
+            conn.close()
+    print(f"[OK] Warmed up {len(connections)} pooled connection(s)")
 
 
 # Database Setup Function
 def setup_database():
-    if not database_exists(DATABASE_URL):
-        print(f"Database '{DBNAME}' does not exist. Creating...")
-        create_database(DATABASE_URL)
-        print("[OK] Database created!")
-
-    engine = create_engine(DATABASE_URL, poolclass=NullPool)
-
-    with engine.connect() as conn:
-        print("[OK] Connected to DB")
-
-        schema_sql = """
-        CREATE TABLE IF NOT EXISTS colleges (
-            college_code VARCHAR(10) PRIMARY KEY,
-            college_name VARCHAR(255) NOT NULL
-        );
-
-        CREATE TABLE IF NOT EXISTS programs (
-            program_code VARCHAR(10) PRIMARY KEY,
-            program_name VARCHAR(255) NOT NULL,
-            college_code VARCHAR(10) NOT NULL,
-            FOREIGN KEY (college_code) REFERENCES colleges(college_code) ON DELETE CASCADE
-        );
-
-        CREATE TABLE IF NOT EXISTS students (
-            student_id VARCHAR(20) PRIMARY KEY,
-            first_name VARCHAR(100) NOT NULL,
-            last_name VARCHAR(100) NOT NULL,
-            gender VARCHAR(10) NOT NULL CHECK (gender IN ('M', 'F', 'Others')),
-            program_code VARCHAR(10) NOT NULL,
-            year_level INTEGER NOT NULL CHECK (year_level BETWEEN 1 AND 5),
-            profile_image_url TEXT,
-            FOREIGN KEY (program_code) REFERENCES programs(program_code) ON DELETE CASCADE
-        );
-
-        CREATE TABLE IF NOT EXISTS users (
-            id SERIAL PRIMARY KEY,
-            email VARCHAR(255) UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            first_name VARCHAR(100),
-            last_name VARCHAR(100),
-            profile_image_url TEXT
-        );
-        """
-
-        conn.execute(text(schema_sql))
-        conn.commit()
-        print("[OK] Tables created or verified.")
-
+    """Create the engine and verify the schema version. Schema changes are
+    applied out of band with `flask --app app migrate`."""
+    engine = create_db_engine()
+    if check_schema_version(engine) is not None:
+        warm_up_pool(engine, DB_POOL_WARMUP)
     return engine
 
 
-# Initialize D
-engine = setup_database()
-
-
-# Import & Register Blueprints
-from routes.student_routes import init_student_routes
-from routes.college_routes import init_college_routes
-from routes.program_routes import init_program_routes
-from routes.authentication_routes import init_auth_routes
-
-student_bp = init_student_routes(engine)
-college_bp = init_college_routes(engine)
-program_bp = init_program_routes(engine)
-auth_bp = init_auth_routes(engine)
-
-app.register_blueprint(student_bp)
-app.register_blueprint(college_bp)
-app.register_blueprint(program_bp)
-app.register_blueprint(auth_bp)
-
-# Serve React App 
-@app.errorhandler(404)
-def not_found(e):
-    # If it's an API route, return JSON error
-    if request.path.startswith('/api/'):
-        return {'error': 'Not found'}, 404
-    # Otherwise serve React app
-    return send_from_directory(app.static_folder, 'index.html')
-
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve_react(path):
-    # Check if it's a static file that exists
-    if path and os.path.exists(os.path.join(app.static_folder, path)):
-        return send_from_directory(app.static_folder, path)
-    # Otherwise serve index.html for React Router
-    return send_from_directory(app.static_folder, 'index.html')
+# App Factory
+def create_app():
+    """
+    Build the Flask app: engine, hooks, CLI commands, blueprints and the React
+    build index. Importing this module only reads configuration, so processes
+    that re-import it (spawned thumbnail workers) do not set up a second app.
+    """
+    # No built-in static route: serve_react sends the build from an in-memory index
+    app = Flask(__name__, static_folder=None)
+
+    # jsonify / request.get_json go through orjson when it is installed
+    app.json = FastJSONProvider(app)
+
+    CORS(
+        app,
+        supports_credentials=True,
+        origins=["http://localhost:3000", "http://localhost:5000", "http://127.0.0.1:5000"],
+        allow_headers=["Content-Type", "Authorization"],
+        methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"]
+    )
+
+    # JWT Configuration
+    app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
+    app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY")
+    app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=1)
+
+    JWTManager(app)
+
+    # Initialize DB
+    engine = setup_database()
+
+    # Per-request query counts / DB time (Server-Timing header) and the slow-query log
+    instrument_engine(engine)
+    init_request_timing(app)
+
+    # Prometheus metrics (request latency / status / in-flight, pool checkouts); no-op without prometheus_client
+    instrument_pool(engine)
+    init_request_metrics(app)
+
+    @app.cli.command("migrate")
+    def migrate_command():
+        """Create the database if needed and apply pending schema migrations"""
+        ensure_database(DATABASE_URL)
+        applied = apply_migrations(engine)
+        if applied:
+            print(f"[OK] Applied migrations: {', '.join(str(v) for v in applied)}")
+        else:
+            print("[OK] Database schema is up to date.")
+
+    @app.cli.command("jobs-worker")
+    def jobs_worker_command():
+        """Process background jobs (storage side effects) in the foreground"""
+        print("[OK] Job worker running. Press Ctrl+C to stop.")
+        run_worker_forever(engine)
+
+    # Register Blueprints
+    student_bp = init_student_routes(engine)
+    college_bp = init_college_routes(engine)
+    program_bp = init_program_routes(engine)
+    auth_bp = init_auth_routes(engine)
+    health_bp = init_health_routes(engine)
+    stats_bp = init_stats_routes(engine)
+    metrics_bp = init_metrics_routes(engine)
+
+    app.register_blueprint(student_bp)
+    app.register_blueprint(college_bp)
+    app.register_blueprint(program_bp)
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(health_bp)
+    app.register_blueprint(stats_bp)
+    app.register_blueprint(metrics_bp)
+
+    # gzip/brotli for API responses (registered after the timing hooks so their totals include it)
+    init_compression(app, [student_bp, college_bp, program_bp, auth_bp, health_bp, stats_bp])
+
+    # Serve files stored by the local storage backend (STORAGE_BACKEND=local)
+    @app.route(f"{LOCAL_STORAGE_URL}/<path:path>")
+    def serve_local_media(path):
+        return send_from_directory(LOCAL_STORAGE_ROOT, path)
+
+    # Serve React App
+    # File list, cache policy and .gz/.br sidecars are read once here; restart after a new build
+    static_index = StaticIndex(FRONTEND_BUILD_PATH)
+
+    @app.errorhandler(404)
+    def not_found(e):
+        # If it's an API route, return JSON error
+        if request.path.startswith('/api/'):
+            return {'error': 'Not found'}, 404
+        # Otherwise serve React app
+        return static_index.send(static_index.index_name)
+
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve_react(path):
+        # Unknown API routes stay JSON 404s
+        if path.startswith('api/'):
+            return {'error': 'Not found'}, 404
+        # Build files come from the startup index; anything else gets index.html for React Router
+        return static_index.send(path)
+
+    # Engine for CLI commands and start_serving_workers
+    app.extensions["db_engine"] = engine
+    return app
+
+
+def start_serving_workers(app):
+    """
+    Background workers for queued jobs, for processes that serve HTTP only
+    (gunicorn's post_worker_init hook and the dev server below); CLI commands
+    such as migrate and jobs-worker never start them. JOBS_WORKER_THREADS=0
+    when a dedicated `jobs-worker` process is used.
+    """
+    start_job_workers(app.extensions["db_engine"])
 
 
 if __name__ == "__main__":
+    app = create_app()
+    # debug=True runs the reloader: only its child process serves requests
+    if is_running_from_reloader():
+        start_serving_workers(app)
     app.run(debug=True)
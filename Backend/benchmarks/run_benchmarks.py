@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+API benchmark / load test for CCC181SSISWEBapplication.
+
+Seeds a dedicated local Postgres database at the requested scale (using the
+generators in scripts/seed_db.py), then runs the scenarios in scenarios.py
+against the real Flask app and prints p50/p95/p99 latency and throughput
+as JSON.
+
+Reads DB credentials from the environment / .env (user, password, host, port);
+the benchmark database name defaults to ssis_bench and is created if missing.
+
+Usage (from Backend/):
+  python benchmarks/run_benchmarks.py --scale 10k
+  python benchmarks/run_benchmarks.py --scale 100k --concurrency 8 --output results.json
+  python benchmarks/run_benchmarks.py --base-url http://127.0.0.1:5000   # a running server
+
+By default requests go through Flask's test client in this process, which
+measures the app and database without network overhead. --base-url sends
+real HTTP requests instead (the server must use the same database).
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, os.path.join(BACKEND, 'scripts'))
+
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(BACKEND, '.env'))
+
+import seed_db
+from scenarios import BENCH_USER_EMAIL, BENCH_USER_PASSWORD, SCENARIOS, ScenarioState
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+NUM_COLLEGES = 30
+NUM_PROGRAMS = 30
+
+
+def parse_scale(value):
+    value = value.lower()
+    if value in SCALES:
+        return SCALES[value]
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"scale must be one of {', '.join(SCALES)} or a number")
+
+
+# ---------------------------------------------------------------------------
+# Database seeding
+# ---------------------------------------------------------------------------
+
+def seed_database(database_url, scale, seed, reseed, workers):
+    """Create, migrate and seed the benchmark database unless it already holds `scale` students"""
+    from sqlalchemy import create_engine, text
+    from utils.migrations import apply_migrations, ensure_database
+
+    ensure_database(database_url)
+    engine = create_engine(database_url)
+    apply_migrations(engine)
+
+    with engine.connect() as conn:
+        seeded = conn.execute(text("SELECT COUNT(*) FROM students")).scalar()
+    if seeded == scale and not reseed:
+        print(f"[OK] Reusing benchmark database ({seeded} students)", file=sys.stderr)
+        return
+
+    url = engine.url
+    conn_str = f"dbname={url.database} user={url.username} password={url.password} host={url.host} port={url.port}"
+    started_at = time.perf_counter()
+    # Keep stdout clean for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        seed_db.seed_all(conn_str, NUM_COLLEGES, NUM_PROGRAMS, scale, seed, workers, truncate=True)
+    print(f"[OK] Seeded {scale} students in {time.perf_counter() - started_at:.1f}s", file=sys.stderr)
+
+
+# ---------------------------------------------------------------------------
+# Clients
+# ---------------------------------------------------------------------------
+
+class InProcessClient:
+    """Requests through Flask's test client (one per thread)"""
+
+    def __init__(self, app):
+        self._app = app
+        self._local = threading.local()
+
+    def _client(self):
+        if not hasattr(self._local, "client"):
+            self._local.client = self._app.test_client()
+        return self._local.client
+
+    def _request(self, method, path, payload=None):
+        response = self._client().open(path, method=method, json=payload)
+        response.get_data()  # drain streamed bodies
+        return response.status_code
+
+    def get(self, path):
+        return self._request("GET", path)
+
+    def post(self, path, payload):
+        return self._request("POST", path, payload)
+
+    def put(self, path, payload):
+        return self._request("PUT", path, payload)
+
+    def delete(self, path, payload):
+        return self._request("DELETE", path, payload)
+
+
+class HttpClient:
+    """Requests over HTTP to a running server"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def _request(self, method, path, payload=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+    def get(self, path):
+        return self._request("GET", path)
+
+    def post(self, path, payload):
+        return self._request("POST", path, payload)
+
+    def put(self, path, payload):
+        return self._request("PUT", path, payload)
+
+    def delete(self, path, payload):
+        return self._request("DELETE", path, payload)
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_scenario(name, func, client, state, iterations, concurrency, seed):
+    """Run `iterations` operations over `concurrency` threads and summarize them"""
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def worker(worker_no, count):
+        rng = random.Random(f"{seed}-{name}-{worker_no}")
+        for _ in range(count):
+            started_at = time.perf_counter()
+            codes = func(client, rng, state)
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            if not codes:
+                continue
+            with lock:
+                latencies.append(elapsed_ms)
+                for code in codes:
+                    statuses[str(code)] = statuses.get(str(code), 0) + 1
+
+    shares = [iterations // concurrency + (1 if i < iterations % concurrency else 0) for i in range(concurrency)]
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker, i, n) for i, n in enumerate(shares) if n]:
+            future.result()
+    wall_seconds = time.perf_counter() - started_at
+
+    latencies.sort()
+    requests = sum(statuses.values())
+    errors = sum(n for code, n in statuses.items() if not code.startswith(("2", "3")))
+    return {
+        "operations": len(latencies),
+        "requests": requests,
+        "errors": errors,
+        "statusCodes": statuses,
+        "wallSeconds": round(wall_seconds, 3),
+        "throughputOpsPerSec": round(len(latencies) / wall_seconds, 2) if wall_seconds else None,
+        "throughputReqPerSec": round(requests / wall_seconds, 2) if wall_seconds else None,
+        "latencyMs": {
+            "p50": _round(percentile(latencies, 50)),
+            "p95": _round(percentile(latencies, 95)),
+            "p99": _round(percentile(latencies, 99)),
+            "mean": _round(statistics.fmean(latencies)) if latencies else None,
+            "max": _round(latencies[-1]) if latencies else None,
+        },
+    }
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SSIS REST API")
+    parser.add_argument("--scale", type=parse_scale, default=SCALES["10k"], help="students to seed: 10k, 100k, 1m or a number")
+    parser.add_argument("--dbname", default=os.getenv("BENCH_DBNAME", "ssis_bench"), help="benchmark database (created if missing)")
+    parser.add_argument("--seed", type=int, default=181, help="random seed for data and scenarios")
+    parser.add_argument("--seed-workers", type=int, default=os.cpu_count() or 1, help="parallel COPY processes while seeding")
+    parser.add_argument("--reseed", action="store_true", help="reseed even if the database already has --scale students")
+    parser.add_argument("--iterations", type=int, default=200, help="operations per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed operations per scenario first")
+    parser.add_argument("--concurrency", type=int, default=4, help="client threads")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--base-url", help="benchmark a running server over HTTP instead of in-process")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    selected = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in selected if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    # The app reads these at import time
+    os.environ["dbname"] = args.dbname
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("SLOW_QUERY_MS", "-1")
+    for name in ("user", "password", "host", "port"):
+        if not os.getenv(name):
+            print(f"Database credentials are not fully set: missing '{name}'", file=sys.stderr)
+            sys.exit(1)
+
+    database_url = (
+        f"postgresql+psycopg2://{os.environ['user']}:{os.environ['password']}"
+        f"@{os.environ['host']}:{os.environ['port']}/{args.dbname}"
+    )
+    seed_database(database_url, args.scale, args.seed, args.reseed, args.seed_workers)
+
+    if args.base_url:
+        client = HttpClient(args.base_url)
+    else:
+        os.chdir(BACKEND)
+        from app import create_app, start_serving_workers
+        app = create_app()
+        start_serving_workers(app)
+        client = InProcessClient(app)
+
+    client.post("/api/auth/signup", {
+        "email": BENCH_USER_EMAIL, "password": BENCH_USER_PASSWORD, "confirm_password": BENCH_USER_PASSWORD,
+        "first_name": "Bench", "last_name": "User",
+    })
+
+    programs = [f"{seed_db.PROGRAM_PREFIX}{i:02d}" for i in range(1, NUM_PROGRAMS + 1)]
+    state = ScenarioState(run_id=f"{int(time.time()) % 100000:05d}", programs=programs)
+
+    results = {}
+    for name in selected:
+        func = SCENARIOS[name]
+        if args.warmup:
+            run_scenario(name, func, client, state, args.warmup, args.concurrency, f"warmup-{args.seed}")
+        results[name] = run_scenario(name, func, client, state, args.iterations, args.concurrency, args.seed)
+        summary = results[name]["latencyMs"]
+        print(f"{name:>20}: p50 {summary['p50']} ms, p95 {summary['p95']} ms, p99 {summary['p99']} ms, "
+              f"{results[name]['throughputOpsPerSec']} ops/s", file=sys.stderr)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "mode": "http" if args.base_url else "in-process",
+        "scale": args.scale,
+        "seed": args.seed,
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"[OK] Wrote {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
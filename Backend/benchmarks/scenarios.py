@@ -0,0 +1,111 @@
+"""
+Scripted API scenarios for run_benchmarks.py.
+
+Each scenario is a function(client, rng, state) that performs one logical
+operation and returns the list of HTTP status codes it produced. A
+"search as you type" operation issues one request per keystroke, so its
+latency is the time to type the whole word. `state` is shared between
+threads and carries ids from create -> update -> delete.
+"""
+import threading
+from collections import deque
+
+import seed_db
+
+
+BENCH_USER_EMAIL = "bench@example.com"
+BENCH_USER_PASSWORD = "bench-password"
+PAGE_SIZE = 50
+
+
+class ScenarioState:
+    """Ids handed from one scenario to the next (thread-safe)"""
+
+    def __init__(self, run_id, programs):
+        self.run_id = run_id
+        self.programs = programs
+        self._counter = 0
+        self._lock = threading.Lock()
+        self.created = deque()
+        self.renamed = deque()
+
+    def next_id(self, prefix):
+        with self._lock:
+            self._counter += 1
+            return f"{prefix}{self.run_id}-{self._counter:06d}"
+
+
+def _student_payload(rng, state, student_id):
+    return {
+        "student_id": student_id,
+        "first_name": rng.choice(seed_db.FIRST_NAMES),
+        "last_name": rng.choice(seed_db.LAST_NAMES),
+        "gender": rng.choice(["M", "F", "Others"]),
+        "program_code": rng.choice(state.programs),
+        "year_level": rng.randint(1, 5),
+    }
+
+
+def list_students(client, rng, state):
+    sort_by = rng.choice(["student_id", "last_name", "first_name", "year_level"])
+    return [client.get(f"/api/students?limit={PAGE_SIZE}&sort_by={sort_by}&sort={rng.choice(['asc', 'desc'])}")]
+
+
+def search_as_you_type(client, rng, state):
+    word = rng.choice(seed_db.LAST_NAMES + seed_db.FIRST_NAMES)
+    return [client.get(f"/api/students?limit=20&search={word[:n]}") for n in range(1, len(word) + 1)]
+
+
+def filtered_list(client, rng, state):
+    genders = ",".join(rng.sample(["M", "F", "Others"], rng.randint(1, 2)))
+    years = ",".join(str(y) for y in rng.sample(range(1, 6), rng.randint(1, 3)))
+    programs = ",".join(rng.sample(state.programs, min(3, len(state.programs))))
+    return [client.get(f"/api/students?limit={PAGE_SIZE}&genders={genders}&year_levels={years}&programs={programs}")]
+
+
+def create_student(client, rng, state):
+    student_id = state.next_id("B")
+    status = client.post("/api/students", _student_payload(rng, state, student_id))
+    if status == 201:
+        state.created.append(student_id)
+    return [status]
+
+
+def update_student_id(client, rng, state):
+    try:
+        old_id = state.created.popleft()
+    except IndexError:
+        return []
+    new_id = state.next_id("R")
+    payload = _student_payload(rng, state, new_id)
+    payload["old_id"] = old_id
+    status = client.put("/api/students", payload)
+    state.renamed.append(new_id if status == 200 else old_id)
+    return [status]
+
+
+def delete_student(client, rng, state):
+    try:
+        student_id = state.renamed.popleft()
+    except IndexError:
+        try:
+            student_id = state.created.popleft()
+        except IndexError:
+            return []
+    return [client.delete("/api/students", {"student_id": student_id})]
+
+
+def login(client, rng, state):
+    return [client.post("/api/auth/login", {"email": BENCH_USER_EMAIL, "password": BENCH_USER_PASSWORD})]
+
+
+# Run order matters: update consumes ids from create, delete consumes ids from update
+SCENARIOS = {
+    "list": list_students,
+    "search_as_you_type": search_as_you_type,
+    "filtered_list": filtered_list,
+    "create": create_student,
+    "update_id_change": update_student_id,
+    "delete": delete_student,
+    "login": login,
+}
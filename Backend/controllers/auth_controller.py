@@ -37,13 +37,10 @@ class AuthController:
             if len(password) < 6:
                 return jsonify({"error": "Password must be at least 6 characters"}), 400
 
-            # Check if email exists
-            if self.model.email_exists(email):
-                return jsonify({"error": "Email already registered"}), 400
-
-            # Create user
+            # Create user; the unique email constraint rejects duplicates
             password_hash = generate_password_hash(password)
-            self.model.create(email, password_hash, first_name, last_name)
+            if not self.model.create(email, password_hash, first_name, last_name):
+                return jsonify({"error": "Email already registered"}), 400
 
             return jsonify({"message": "Signup successful"}), 201
 
@@ -1,5 +1,10 @@
 from flask import jsonify, request
 from models.college_model import CollegeModel
+from models.version_model import VersionModel
+from utils.etag import collection_etag, not_modified, with_etag
+from utils.db_errors import ModelError
+from utils.batch import parse_code_list
+from utils.pagination import parse_limit
 
 
 class CollegeController:
@@ -7,17 +12,35 @@ class CollegeController:
     
     def __init__(self, engine):
         self.model = CollegeModel(engine)
+        self.versions = VersionModel(engine)
 
     def get_colleges(self):
         """Get all colleges with optional search and sort"""
         try:
+            # Answer 304 from the table's change counter before running the list query;
+            # the same versions key the per-worker cache so its body matches the ETag
+            versions = self.versions.get_versions(["colleges"])
+            etag = collection_etag(versions)
+            unchanged = not_modified(etag)
+            if unchanged:
+                return unchanged
+
             sort = request.args.get('sort', 'asc')
             sort_by = request.args.get('sort_by', 'college_code')
             search = request.args.get('search', '').strip()
             search_field = request.args.get('search_field', 'all')
             
-            colleges = self.model.get_all(sort, sort_by, search, search_field)
-            return jsonify(colleges), 200
+            # Keyset pagination is opt-in so existing clients keep receiving a plain array
+            if 'limit' in request.args or 'after' in request.args:
+                limit = parse_limit(request.args.get('limit'))
+                after = request.args.get('after') or None
+                page = self.model.get_page(sort, sort_by, search, search_field, limit, after, versions)
+                return with_etag(jsonify(page), etag)
+
+            colleges = self.model.get_all(sort, sort_by, search, search_field, versions)
+            return with_etag(jsonify(colleges), etag)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -38,11 +61,10 @@ class CollegeController:
             if not college_code or not college_name:
                 return jsonify({"error": "College code and name are required"}), 400
             
-            if self.model.exists(college_code):
-                return jsonify({"error": "College code already exists"}), 409
-            
             self.model.create(college_code, college_name)
             return jsonify({"message": "College added successfully"}), 201
+        except ModelError as e:
+            return jsonify({"error": str(e)}), e.status_code
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -57,14 +79,10 @@ class CollegeController:
             if not old_code or not new_code or not college_name:
                 return jsonify({"error": "All fields are required"}), 400
             
-            if not self.model.exists(old_code):
-                return jsonify({"error": "College not found"}), 404
-            
-            if old_code != new_code and self.model.exists(new_code):
-                return jsonify({"error": "New college code already exists"}), 409
-            
             self.model.update(old_code, new_code, college_name)
             return jsonify({"message": "College updated successfully"}), 200
+        except ModelError as e:
+            return jsonify({"error": str(e)}), e.status_code
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -77,10 +95,31 @@ class CollegeController:
             if not college_code:
                 return jsonify({"error": "College code is required"}), 400
             
-            if not self.model.exists(college_code):
-                return jsonify({"error": "College not found"}), 404
-            
             self.model.delete(college_code)
             return jsonify({"message": "College deleted and programs reassigned to N/A"}), 200
+        except ModelError as e:
+            return jsonify({"error": str(e)}), e.status_code
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    def batch_colleges(self):
+        """Delete a list of colleges in one statement, moving their programs to N/A"""
+        try:
+            data = request.get_json() or {}
+            if data.get('action') != 'delete':
+                return jsonify({"error": "action must be 'delete'"}), 400
+            codes = parse_code_list(data.get('college_codes'), 'college_codes')
+
+            deleted, reassigned = self.model.delete_many(codes)
+            deleted = set(deleted)
+            return jsonify({
+                "deleted": len(deleted),
+                "reassigned": reassigned,
+                "notFound": [code for code in codes if code not in deleted]
+            }), 200
+        except ModelError as e:
+            return jsonify({"error": str(e)}), e.status_code
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             return jsonify({"error": str(e)}), 500
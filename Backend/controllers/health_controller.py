@@ -0,0 +1,45 @@
+from flask import jsonify
+from sqlalchemy import text
+from utils.cache import cache_stats
+from utils.jobs import job_counts
+
+
+class HealthController:
+    """Controller for health check operations"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def pool_status(self):
+        """Describe the connection pool (NullPool has no counters to report)"""
+        pool = self.engine.pool
+        if not hasattr(pool, "checkedout"):
+            return {"mode": "null"}
+
+        return {
+            "mode": "queue",
+            "size": pool.size(),
+            "checkedOut": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": pool.overflow(),
+        }
+
+    def database_health(self):
+        """Ping the database and report pool usage"""
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return jsonify({"status": "ok", "pool": self.pool_status()}), 200
+        except Exception as e:
+            return jsonify({"status": "error", "error": str(e), "pool": self.pool_status()}), 503
+
+    def cache_health(self):
+        """Report hit/miss counters for this worker's list caches"""
+        return jsonify(cache_stats()), 200
+
+    def jobs_health(self):
+        """Report queued background jobs by status"""
+        try:
+            return jsonify(job_counts(self.engine)), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
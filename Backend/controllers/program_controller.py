@@ -1,5 +1,10 @@
 from flask import jsonify, request
 from models.program_model import ProgramModel
+from models.version_model import VersionModel
+from utils.etag import collection_etag, not_modified, with_etag
+from utils.db_errors import ModelError
+from utils.batch import parse_code_list
+from utils.pagination import parse_limit
 
 
 class ProgramController:
@@ -7,10 +12,20 @@ class ProgramController:
     
     def __init__(self, engine):
         self.model = ProgramModel(engine)
+        self.versions = VersionModel(engine)
 
     def get_programs(self):
         """Get all programs with optional search and sort"""
         try:
+            # Answer 304 from the change counters before running the list query;
+            # rows show their college's code, so college renames change the list too.
+            # The same versions key the per-worker cache so its body matches the ETag
+            versions = self.versions.get_versions(["programs", "colleges"])
+            etag = collection_etag(versions)
+            unchanged = not_modified(etag)
+            if unchanged:
+                return unchanged
+
             sort = request.args.get('sort', 'asc')
             sort_by = request.args.get('sort_by', 'program_code')
             search = request.args.get('search', '').strip()
@@ -20,8 +35,17 @@ class ProgramController:
             colleges_param = request.args.get('colleges', '')
             colleges = [c.strip() for c in colleges_param.split(',') if c.strip()] if colleges_param else None
             
-            programs = self.model.get_all(sort, sort_by, search, search_field, colleges)
-            return jsonify(programs), 200
+            # Keyset pagination is opt-in so existing clients keep receiving a plain array
+            if 'limit' in request.args or 'after' in request.args:
+                limit = parse_limit(request.args.get('limit'))
+                after = request.args.get('after') or None
+                page = self.model.get_page(sort, sort_by, search, search_field, colleges, limit, after, versions)
+                return with_etag(jsonify(page), etag)
+
+            programs = self.model.get_all(sort, sort_by, search, search_field, colleges, versions)
+            return with_etag(jsonify(programs), etag)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -36,14 +60,11 @@ class ProgramController:
             if not program_code or not program_name or not college_code:
                 return jsonify({"error": "All fields are required"}), 400
             
-            if self.model.exists(program_code):
-                return jsonify({"error": "Program code already exists"}), 409
-            
-            if not self.model.college_exists(college_code):
-                return jsonify({"error": "College code does not exist"}), 400
-            
+            # Duplicate codes and unknown colleges are rejected by the INSERT's constraints
             self.model.create(program_code, program_name, college_code)
             return jsonify({"message": "Program added successfully"}), 201
+        except ModelError as e:
+            return jsonify({"error": str(e)}), e.status_code
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -59,17 +80,10 @@ class ProgramController:
             if not old_code or not new_code or not program_name or not college_code:
                 return jsonify({"error": "All fields are required"}), 400
             
-            if not self.model.exists(old_code):
-                return jsonify({"error": "Program not found"}), 404
-            
-            if old_code != new_code and self.model.exists(new_code):
-                return jsonify({"error": "New program code already exists"}), 409
-            
-            if not self.model.college_exists(college_code):
-                return jsonify({"error": "College code does not exist"}), 400
-            
             self.model.update(old_code, new_code, program_name, college_code)
             return jsonify({"message": "Program updated successfully"}), 200
+        except ModelError as e:
+            return jsonify({"error": str(e)}), e.status_code
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -82,10 +96,31 @@ class ProgramController:
             if not program_code:
                 return jsonify({"error": "Program code is required"}), 400
             
-            if not self.model.exists(program_code):
-                return jsonify({"error": "Program not found"}), 404
-            
             self.model.delete(program_code)
             return jsonify({"message": "Program deleted successfully"}), 200
+        except ModelError as e:
+            return jsonify({"error": str(e)}), e.status_code
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    def batch_programs(self):
+        """Delete a list of programs in one statement, moving their students to N/A"""
+        try:
+            data = request.get_json() or {}
+            if data.get('action') != 'delete':
+                return jsonify({"error": "action must be 'delete'"}), 400
+            codes = parse_code_list(data.get('program_codes'), 'program_codes')
+
+            deleted, reassigned = self.model.delete_many(codes)
+            deleted = set(deleted)
+            return jsonify({
+                "deleted": len(deleted),
+                "reassigned": reassigned,
+                "notFound": [code for code in codes if code not in deleted]
+            }), 200
+        except ModelError as e:
+            return jsonify({"error": str(e)}), e.status_code
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             return jsonify({"error": str(e)}), 500
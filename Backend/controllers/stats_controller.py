@@ -0,0 +1,68 @@
+from flask import jsonify
+from models.stats_model import StatsModel
+from models.version_model import VersionModel
+from utils.etag import collection_etag, not_modified, with_etag
+
+
+def _new_bucket():
+    return {"count": 0, "byGender": {}, "byYearLevel": {}}
+
+
+def _add(bucket, row):
+    """Accumulate one view row into a bucket (empty-program rows only add zero)"""
+    count = row["count"]
+    bucket["count"] += count
+    if row["gender"] is not None:
+        bucket["byGender"][row["gender"]] = bucket["byGender"].get(row["gender"], 0) + count
+    if row["yearLevel"] is not None:
+        year = str(row["yearLevel"])
+        bucket["byYearLevel"][year] = bucket["byYearLevel"].get(year, 0) + count
+
+
+class StatsController:
+    """Controller for dashboard statistics"""
+
+    def __init__(self, engine):
+        self.model = StatsModel(engine)
+        self.versions = VersionModel(engine)
+
+    def get_stats(self):
+        """Headcounts overall, per college and per program, split by gender and year level"""
+        try:
+            etag = collection_etag(self.versions.get_versions(["student_stats"]))
+            unchanged = not_modified(etag)
+            if unchanged:
+                return unchanged
+
+            totals = _new_bucket()
+            colleges = {}
+            for row in self.model.get_rows():
+                college = colleges.get(row["college"])
+                if college is None:
+                    college = colleges[row["college"]] = {
+                        "code": row["college"],
+                        "name": row["collegeName"],
+                        **_new_bucket(),
+                        "programs": {},
+                    }
+                program = college["programs"].get(row["program"])
+                if program is None:
+                    program = college["programs"][row["program"]] = {
+                        "code": row["program"],
+                        "name": row["programName"],
+                        **_new_bucket(),
+                    }
+                for bucket in (totals, college, program):
+                    _add(bucket, row)
+
+            for college in colleges.values():
+                college["programs"] = list(college["programs"].values())
+
+            return with_etag(jsonify({
+                "total": totals["count"],
+                "byGender": totals["byGender"],
+                "byYearLevel": totals["byYearLevel"],
+                "colleges": list(colleges.values()),
+            }), etag)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
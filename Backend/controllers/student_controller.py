@@ -1,6 +1,37 @@
+import time
 from flask import jsonify, request
-from models.student_model import StudentModel
-from utils.supabase_client import rename_student_image, delete_student_image
+from sqlalchemy.exc import IntegrityError
+from models.student_model import StudentModel, BATCH_FILTER_COLUMNS, BATCH_UPDATE_FIELDS, RESPONSE_COLUMNS
+from models.version_model import VersionModel
+from utils.etag import collection_etag, not_modified, with_etag
+from utils.db_errors import ModelError
+from utils.pagination import parse_limit
+from utils.serialization import encode_rows, parse_encoding
+from utils.streaming import STREAM_FORMATS, stream_rows
+from utils.student_import import detect_format, parse_student_rows
+from utils.avatars import plan_image_rename
+from utils.storage import get_storage
+from utils.thumbnails import create_thumbnails, thumbnail_url, thumbnails_available
+
+
+# Cap on per-row errors returned by the import endpoint
+MAX_REPORTED_ERRORS = 1000
+
+# Cap on operations accepted by one batch request
+MAX_BATCH_OPERATIONS = 10000
+
+# Largest image accepted by the upload endpoint (matches the frontend limit)
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+
+
+def _parse_int(value, label):
+    """Whole number from JSON (a number or numeric string); ValueError otherwise"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{label} must be a whole number")
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{label} must be a whole number")
 
 
 class StudentController:
@@ -8,10 +39,18 @@ class StudentController:
     
     def __init__(self, engine):
         self.model = StudentModel(engine)
+        self.versions = VersionModel(engine)
 
     def get_students(self):
         """Get all students with optional search and sort"""
         try:
+            # Answer 304 from the change counters before running the list query;
+            # rows show their program's code, so program renames change the list too
+            etag = collection_etag(self.versions.get_versions(["students", "programs"]))
+            unchanged = not_modified(etag)
+            if unchanged:
+                return unchanged
+
             sort = request.args.get('sort', 'asc')
             sort_by = request.args.get('sort_by', 'student_id')
             search = request.args.get('search', '').strip()
@@ -20,7 +59,8 @@ class StudentController:
             # Map frontend column names to database column names
             column_mapping = {
                 'id': 'student_id',
-                'name': 'first_name'
+                'name': 'first_name',
+                'course': 'program_code'
             }
             sort_by = column_mapping.get(sort_by, sort_by)
             
@@ -34,8 +74,34 @@ class StudentController:
             programs_param = request.args.get('programs', '')
             programs = [p.strip() for p in programs_param.split(',') if p.strip()] if programs_param else None
             
-            students = self.model.get_all(sort, sort_by, search, search_field, genders, year_levels, programs)
-            return jsonify(students), 200
+            # Facet counts turn the response into {"items", "facets"}
+            facets = request.args.get('facets', '').lower() in ('1', 'true', 'yes')
+            # encoding=columnar answers {"columns", "rows"} instead of one object per student
+            encoding = parse_encoding(request.args.get('encoding'))
+
+            # Keyset pagination is opt-in so existing clients keep receiving a plain array
+            if 'limit' in request.args or 'after' in request.args:
+                limit = parse_limit(request.args.get('limit'))
+                after = request.args.get('after') or None
+                page = self.model.get_page(sort, sort_by, search, search_field, genders, year_levels, programs, limit, after, as_rows=True)
+                extra = {"nextCursor": page["nextCursor"]}
+                if facets:
+                    extra["facets"] = self.model.get_facets(search, search_field, genders, year_levels, programs)
+                return with_etag(jsonify(encode_rows(RESPONSE_COLUMNS, page["items"], encoding, **extra)), etag)
+
+            # Streamed output keeps memory flat for very large listings
+            fmt = request.args.get('format', 'json')
+            if fmt in STREAM_FORMATS:
+                if facets or encoding != "objects":
+                    raise ValueError("facets and columnar encoding are not available for streamed formats")
+                batches = self.model.iter_all(sort, sort_by, search, search_field, genders, year_levels, programs)
+                return with_etag(stream_rows(batches, fmt), etag)
+
+            rows = self.model.get_rows(sort, sort_by, search, search_field, genders, year_levels, programs)
+            extra = {"facets": self.model.get_facets(search, search_field, genders, year_levels, programs)} if facets else {}
+            return with_etag(jsonify(encode_rows(RESPONSE_COLUMNS, rows, encoding, **extra)), etag)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -54,17 +120,167 @@ class StudentController:
             if not all([student_id, first_name, last_name, gender, program_code, year_level]):
                 return jsonify({"error": "All fields except profile image are required"}), 400
             
-            if self.model.exists(student_id):
-                return jsonify({"error": "Student ID already exists"}), 409
+            # Images uploaded straight to storage get their thumbnails rendered in the background
+            jobs = []
+            if profile_image_url:
+                jobs.append(("generate_thumbnails", {"student_id": student_id, "image_url": profile_image_url}))
             
-            if not self.model.program_exists(program_code):
-                return jsonify({"error": "Program code does not exist"}), 400
-            
-            self.model.create(student_id, first_name, last_name, gender, program_code, year_level, profile_image_url)
+            # Duplicate IDs and unknown programs are rejected by the INSERT's constraints
+            self.model.create(student_id, first_name, last_name, gender, program_code, year_level, profile_image_url, jobs)
             return jsonify({"message": "Student added successfully"}), 201
+        except ModelError as e:
+            return jsonify({"error": str(e)}), e.status_code
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    def import_students(self):
+        """Bulk import students from a CSV or JSON lines upload"""
+        try:
+            on_conflict = request.args.get('on_conflict', 'skip')
+            upload = request.files.get('file')
+            if upload:
+                fmt = detect_format(upload.filename, upload.mimetype)
+                stream = upload.stream
+            elif request.content_length:
+                fmt = detect_format(None, request.content_type)
+                stream = request.stream
+            else:
+                return jsonify({"error": "Upload a CSV or JSON lines file"}), 400
+
+            rows, errors = parse_student_rows(stream, fmt)
+            imported = 0
+            if rows:
+                imported, db_errors = self.model.bulk_import(rows, on_conflict)
+                errors = sorted(errors + db_errors, key=lambda e: e["row"])
+
+            return jsonify({
+                "imported": imported,
+                "rejected": len(errors),
+                "errors": errors[:MAX_REPORTED_ERRORS]
+            }), 200
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
+    def batch_students(self):
+        """Apply a list of update/delete operations, or one filter-based mutation, in a single transaction"""
+        try:
+            data = request.get_json() or {}
+            if not isinstance(data, dict):
+                return jsonify({"error": "Request body must be a JSON object"}), 400
+
+            if "operations" in data:
+                updates, deletes = self._parse_operations(data["operations"])
+                updated_ids, deleted_rows = self.model.batch_apply(updates, deletes)
+                requested = {u["student_id"] for u in updates} | set(deletes)
+                affected = set(updated_ids) | {row[0] for row in deleted_rows}
+                not_found = sorted(requested - affected)
+            else:
+                action = data.get('action')
+                if action not in ('update', 'delete'):
+                    return jsonify({"error": "action must be 'update' or 'delete'"}), 400
+                where = self._parse_where(data.get('where'))
+                changes = self._parse_changes(data.get('set')) if action == 'update' else None
+                rows = self.model.mutate_where(action, where, changes)
+                updated_ids = [row[0] for row in rows] if action == 'update' else []
+                deleted_rows = rows if action == 'delete' else []
+                not_found = []
+
+            return jsonify({
+                "updated": len(updated_ids),
+                "deleted": len(deleted_rows),
+                "notFound": not_found
+            }), 200
+        except ModelError as e:
+            return jsonify({"error": f"Batch rejected, no changes were made: {e}"}), e.status_code
+        except IntegrityError as e:
+            return jsonify({"error": f"Batch rejected, no changes were made: {str(e.orig).splitlines()[0]}"}), 400
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    def _parse_operations(self, operations):
+        """Validate batch operations into (updates, delete_ids)"""
+        if not isinstance(operations, list) or not operations:
+            raise ValueError("operations must be a non-empty list")
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            raise ValueError(f"A batch may contain at most {MAX_BATCH_OPERATIONS} operations")
+
+        updates = []
+        deletes = []
+        seen = set()
+        for index, op in enumerate(operations):
+            student_id = str(op.get('student_id', '')).strip() if isinstance(op, dict) else ''
+            if not student_id:
+                raise ValueError(f"Operation {index}: student_id is required")
+            if student_id in seen:
+                raise ValueError(f"Operation {index}: student {student_id} appears more than once")
+            seen.add(student_id)
+
+            action = op.get('action')
+            if action == 'delete':
+                deletes.append(student_id)
+            elif action == 'update':
+                changes = op.get('set') or {}
+                if not isinstance(changes, dict):
+                    raise ValueError(f"Operation {index}: set must be an object")
+                unknown = set(changes) - set(BATCH_UPDATE_FIELDS)
+                if unknown:
+                    raise ValueError(f"Operation {index}: cannot set {', '.join(sorted(unknown))}")
+                update = {"student_id": student_id}
+                for field, value in changes.items():
+                    if field == 'year_level':
+                        update[field] = _parse_int(value, f"Operation {index}: year_level")
+                    elif value is not None:
+                        update[field] = str(value).strip() or None
+                updates.append(update)
+            else:
+                raise ValueError(f"Operation {index}: action must be 'update' or 'delete'")
+        return updates, deletes
+
+    def _parse_where(self, where):
+        """Validate a batch filter: an object of non-empty value lists"""
+        if where is None:
+            where = {}
+        if not isinstance(where, dict):
+            raise ValueError("where must be an object")
+        unknown = set(where) - set(BATCH_FILTER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Cannot filter on {', '.join(sorted(unknown))}")
+
+        parsed = {}
+        for key, values in where.items():
+            if values is None:
+                continue
+            if not isinstance(values, list) or any(isinstance(v, (dict, list)) or v is None for v in values):
+                raise ValueError(f"where.{key} must be a list of values")
+            if key == 'year_levels':
+                values = [_parse_int(v, f"where.{key}") for v in values]
+            else:
+                values = [str(v).strip() for v in values]
+            parsed[key] = values
+        return parsed
+
+    def _parse_changes(self, changes):
+        """Validate the set clause of a filter-based update"""
+        if not isinstance(changes, dict):
+            raise ValueError("set must be an object")
+        unknown = set(changes) - {"program_code", "year_level", "year_level_increment"}
+        if unknown:
+            raise ValueError(f"Cannot set {', '.join(sorted(unknown))}")
+
+        parsed = {}
+        if changes.get("program_code") is not None:
+            if not isinstance(changes["program_code"], str):
+                raise ValueError("set.program_code must be a string")
+            parsed["program_code"] = changes["program_code"].strip()
+        for field in ("year_level", "year_level_increment"):
+            if changes.get(field) is not None:
+                parsed[field] = _parse_int(changes[field], f"set.{field}")
+        return parsed
+
     def update_student(self):
         """Update an existing student"""
         try:
@@ -81,20 +297,66 @@ class StudentController:
             if not all([old_id, student_id, first_name, last_name, gender, program_code, year_level]):
                 return jsonify({"error": "All fields except profile image are required"}), 400
             
-            if not self.model.exists(old_id):
+            # If student ID changed and there's an image, store the new URL now and
+            # move the object in the background once the update has committed
+            jobs = []
+            plan = None
+            if old_id != student_id and profile_image_url:
+                plan = plan_image_rename(old_id, student_id, profile_image_url)
+            if plan:
+                old_path, new_path, profile_image_url = plan
+                jobs.append(("move_avatar", {"from": old_path, "to": new_path}))
+            
+            # Missing students, taken IDs and unknown programs come back as ModelErrors;
+            # a moved image keeps its thumbnails, any other new URL gets fresh ones
+            self.model.update(old_id, student_id, first_name, last_name, gender, program_code, year_level,
+                              profile_image_url, jobs, refresh_thumbnails=plan is None)
+            return jsonify({"message": "Student updated successfully"}), 200
+        except ModelError as e:
+            return jsonify({"error": str(e)}), e.status_code
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    def upload_image(self):
+        """Upload a student's image, store resized thumbnails and point the student at them"""
+        try:
+            student_id = request.form.get('student_id', '').strip()
+            upload = request.files.get('file')
+            
+            if not student_id or not upload:
+                return jsonify({"error": "Student ID and image file are required"}), 400
+            
+            if not (upload.mimetype or '').startswith('image/'):
+                return jsonify({"error": "File must be an image"}), 400
+            
+            if not thumbnails_available():
+                return jsonify({"error": "Image processing is not available on this server"}), 501
+            
+            data = upload.read(MAX_IMAGE_BYTES + 1)
+            if len(data) > MAX_IMAGE_BYTES:
+                return jsonify({"error": "Image must be smaller than 10MB"}), 413
+            
+            if not self.model.exists(student_id):
                 return jsonify({"error": "Student not found"}), 404
             
-            if old_id != student_id and self.model.exists(student_id):
-                return jsonify({"error": "New student ID already exists"}), 409
+            storage = get_storage()
+            file_ext = (upload.filename or '').rsplit('.', 1)[-1].lower() if '.' in (upload.filename or '') else 'jpg'
+            path = f"students/{student_id}.{file_ext}"
             
-            # If student ID changed and there's an image, rename it in Supabase
-            if old_id != student_id and profile_image_url:
-                new_image_url = rename_student_image(old_id, student_id)
-                if new_image_url:
-                    profile_image_url = new_image_url
+            thumb_key = create_thumbnails(storage, data)
+            storage.upload(path, data, upload.mimetype)
+            # Timestamp busts browser caches when the same path is overwritten
+            image_url = f"{storage.public_url(path)}?t={int(time.time() * 1000)}"
             
-            self.model.update(old_id, student_id, first_name, last_name, gender, program_code, year_level, profile_image_url)
-            return jsonify({"message": "Student updated successfully"}), 200
+            if not self.model.set_image(student_id, image_url, thumb_key):
+                return jsonify({"error": "Student not found"}), 404
+            
+            return jsonify({
+                "message": "Student image uploaded successfully",
+                "profileImage": image_url,
+                "thumbnail": thumbnail_url(thumb_key),
+                "thumbnailJpeg": thumbnail_url(thumb_key, ext="jpg")
+            }), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -107,13 +369,10 @@ class StudentController:
             if not student_id:
                 return jsonify({"error": "Student ID is required"}), 400
             
-            if not self.model.exists(student_id):
-                return jsonify({"error": "Student not found"}), 404
-            
-            # Delete the student's image from Supabase if it exists
-            delete_student_image(student_id)
-            
+            # The model queues removal of the student's image from storage
             self.model.delete(student_id)
             return jsonify({"message": "Student deleted successfully"}), 200
+        except ModelError as e:
+            return jsonify({"error": str(e)}), e.status_code
         except Exception as e:
             return jsonify({"error": str(e)}), 500
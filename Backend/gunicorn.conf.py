@@ -0,0 +1,18 @@
+# gunicorn --config gunicorn.conf.py 'app:create_app()'
+import os
+from utils.metrics import mark_worker_dead
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+
+def post_worker_init(worker):
+    # In-process job workers run in serving processes only, never in CLI commands
+    from app import start_serving_workers
+    start_serving_workers(worker.wsgi)
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges (in-flight requests, pool checkouts) from /metrics
+    mark_worker_dead(worker.pid)
@@ -0,0 +1,60 @@
+-- Base schema (as first shipped; later migrations evolve it)
+-- Safe to run against databases created by earlier versions of setup_database().
+
+CREATE TABLE IF NOT EXISTS colleges (
+    college_code VARCHAR(10) PRIMARY KEY,
+    college_name VARCHAR(255) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS programs (
+    program_code VARCHAR(10) PRIMARY KEY,
+    program_name VARCHAR(255) NOT NULL,
+    college_code VARCHAR(10) NOT NULL,
+    FOREIGN KEY (college_code) REFERENCES colleges(college_code) ON DELETE RESTRICT
+);
+
+CREATE TABLE IF NOT EXISTS students (
+    student_id VARCHAR(20) PRIMARY KEY,
+    first_name VARCHAR(100) NOT NULL,
+    last_name VARCHAR(100) NOT NULL,
+    gender VARCHAR(10) NOT NULL CHECK (gender IN ('M', 'F', 'Others')),
+    program_code VARCHAR(10) NOT NULL,
+    year_level INTEGER NOT NULL CHECK (year_level BETWEEN 1 AND 5),
+    profile_image_url TEXT,
+    FOREIGN KEY (program_code) REFERENCES programs(program_code) ON DELETE RESTRICT
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    first_name VARCHAR(100),
+    last_name VARCHAR(100),
+    profile_image_url TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Bring older schemas in line: RESTRICT instead of CASCADE, users.created_at
+ALTER TABLE programs
+    DROP CONSTRAINT IF EXISTS programs_college_code_fkey,
+    ADD CONSTRAINT programs_college_code_fkey
+        FOREIGN KEY (college_code) REFERENCES colleges(college_code) ON DELETE RESTRICT;
+
+ALTER TABLE students
+    DROP CONSTRAINT IF EXISTS students_program_code_fkey,
+    ADD CONSTRAINT students_program_code_fkey
+        FOREIGN KEY (program_code) REFERENCES programs(program_code) ON DELETE RESTRICT;
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+INSERT INTO colleges (college_code, college_name) VALUES ('N/A', 'No College Assigned')
+ON CONFLICT (college_code) DO NOTHING;
+
+INSERT INTO programs (program_code, program_name, college_code) VALUES ('N/A', 'No Program Assigned', 'N/A')
+ON CONFLICT (program_code) DO NOTHING;
+
+CREATE INDEX IF NOT EXISTS idx_students_program ON students(program_code);
+CREATE INDEX IF NOT EXISTS idx_students_year ON students(year_level);
+CREATE INDEX IF NOT EXISTS idx_students_name ON students(last_name, first_name);
+CREATE INDEX IF NOT EXISTS idx_programs_college ON programs(college_code);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
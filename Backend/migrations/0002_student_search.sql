@@ -0,0 +1,19 @@
+-- Indexed search path for students
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Upper-cased haystack of every searchable column, maintained by Postgres
+ALTER TABLE students ADD COLUMN IF NOT EXISTS search_text TEXT
+    GENERATED ALWAYS AS (
+        UPPER(student_id || ' ' || first_name || ' ' || last_name || ' ' ||
+              gender || ' ' || program_code || ' ' || year_level::text)
+    ) STORED;
+
+-- Infix search ("all" fields and student ID) through trigram GIN indexes
+CREATE INDEX IF NOT EXISTS idx_students_search_trgm ON students USING gin (search_text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_students_id_trgm ON students USING gin (student_id gin_trgm_ops);
+
+-- Prefix search on single fields and short "all" searches
+CREATE INDEX IF NOT EXISTS idx_students_id_pattern ON students (student_id text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_students_first_name_upper ON students (UPPER(first_name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_students_last_name_upper ON students (UPPER(last_name) text_pattern_ops);
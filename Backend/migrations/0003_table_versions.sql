@@ -0,0 +1,43 @@
+-- Per-table change counters used to build ETags for the list endpoints.
+-- Statement-level triggers bump the counter for any write, including bulk
+-- statements and writes made outside the API.
+--
+-- Trade-off: each bump updates that table's single counter row, and the row
+-- lock is held until the writing transaction commits. Concurrent writers to
+-- the same table therefore queue at the end of their statement (the
+-- statement itself still runs in parallel). Write rates here are low and
+-- transactions short, so this is accepted. A sequence would avoid the lock,
+-- but nextval() is visible before commit: a reader could pair the new version
+-- with pre-commit rows and serve them as fresh until the next write. Keep
+-- transactions that write these tables short.
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR(63) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO table_versions (table_name, version)
+VALUES ('colleges', 0), ('programs', 0), ('students', 0)
+ON CONFLICT (table_name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_colleges_version ON colleges;
+CREATE TRIGGER trg_colleges_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON colleges
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_programs_version ON programs;
+CREATE TRIGGER trg_programs_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON programs
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_students_version ON students;
+CREATE TRIGGER trg_students_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON students
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
@@ -0,0 +1,2 @@
+-- Storage key prefix of a student's generated avatar thumbnails
+ALTER TABLE students ADD COLUMN IF NOT EXISTS profile_thumb_key TEXT;
@@ -0,0 +1,30 @@
+-- Pre-aggregated headcounts for the /api/stats dashboard endpoint.
+-- One row per (college, program, year level, gender) combination; programs
+-- without students appear once with NULL year_level / gender and a zero count.
+-- Refreshed by the job worker when the source tables' versions change.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS student_stats AS
+SELECT
+    c.college_code,
+    c.college_name,
+    p.program_code,
+    p.program_name,
+    s.year_level,
+    s.gender,
+    COUNT(s.student_id) AS student_count
+FROM programs p
+JOIN colleges c ON c.college_code = p.college_code
+LEFT JOIN students s ON s.program_code = p.program_code
+GROUP BY c.college_code, c.college_name, p.program_code, p.program_name, s.year_level, s.gender;
+
+-- Unique index so the view can be refreshed CONCURRENTLY (readers are not blocked)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_student_stats_key
+    ON student_stats (program_code, year_level, gender);
+
+-- Version of the view's contents: the sum of the source tables' versions at
+-- the last refresh. Used for staleness checks and the endpoint's ETag.
+INSERT INTO table_versions (table_name, version)
+SELECT 'student_stats', COALESCE(SUM(version), 0)
+FROM table_versions
+WHERE table_name IN ('colleges', 'programs', 'students')
+ON CONFLICT (table_name) DO NOTHING;
@@ -0,0 +1,14 @@
+-- Let code renames propagate through the foreign keys so a program or
+-- college rename is a single UPDATE (deletes stay RESTRICT).
+
+ALTER TABLE programs
+    DROP CONSTRAINT IF EXISTS programs_college_code_fkey,
+    ADD CONSTRAINT programs_college_code_fkey
+        FOREIGN KEY (college_code) REFERENCES colleges(college_code)
+        ON UPDATE CASCADE ON DELETE RESTRICT;
+
+ALTER TABLE students
+    DROP CONSTRAINT IF EXISTS students_program_code_fkey,
+    ADD CONSTRAINT students_program_code_fkey
+        FOREIGN KEY (program_code) REFERENCES programs(program_code)
+        ON UPDATE CASCADE ON DELETE RESTRICT;
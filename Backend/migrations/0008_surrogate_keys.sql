@@ -0,0 +1,78 @@
+-- Immutable integer keys for colleges and programs. Codes stay unique but are
+-- plain attributes, so renaming a program or college updates one row instead
+-- of rewriting (and locking) every referencing row. Students reference
+-- programs.id and programs reference colleges.id; the API still speaks codes.
+
+-- Objects that depend on the code columns are rebuilt at the end
+DROP MATERIALIZED VIEW IF EXISTS student_stats;
+DROP INDEX IF EXISTS idx_students_search_trgm;
+ALTER TABLE students DROP COLUMN IF EXISTS search_text;
+
+-- New keys
+ALTER TABLE colleges ADD COLUMN IF NOT EXISTS id INTEGER GENERATED ALWAYS AS IDENTITY;
+ALTER TABLE programs ADD COLUMN IF NOT EXISTS id INTEGER GENERATED ALWAYS AS IDENTITY;
+ALTER TABLE programs ADD COLUMN IF NOT EXISTS college_id INTEGER;
+ALTER TABLE students ADD COLUMN IF NOT EXISTS program_id INTEGER;
+
+UPDATE programs p SET college_id = c.id FROM colleges c WHERE c.college_code = p.college_code;
+UPDATE students s SET program_id = p.id FROM programs p WHERE p.program_code = s.program_code;
+
+-- Swap the primary keys; codes keep a unique constraint
+ALTER TABLE students DROP CONSTRAINT IF EXISTS students_program_code_fkey;
+ALTER TABLE programs DROP CONSTRAINT IF EXISTS programs_college_code_fkey;
+
+ALTER TABLE colleges DROP CONSTRAINT colleges_pkey;
+ALTER TABLE colleges ADD CONSTRAINT colleges_pkey PRIMARY KEY (id);
+ALTER TABLE colleges ADD CONSTRAINT colleges_college_code_key UNIQUE (college_code);
+
+ALTER TABLE programs DROP CONSTRAINT programs_pkey;
+ALTER TABLE programs ADD CONSTRAINT programs_pkey PRIMARY KEY (id);
+ALTER TABLE programs ADD CONSTRAINT programs_program_code_key UNIQUE (program_code);
+
+-- Foreign keys on the integer columns; the code copies are dropped
+ALTER TABLE programs ALTER COLUMN college_id SET NOT NULL;
+ALTER TABLE programs ADD CONSTRAINT programs_college_id_fkey
+    FOREIGN KEY (college_id) REFERENCES colleges(id) ON DELETE RESTRICT;
+ALTER TABLE programs DROP COLUMN college_code;
+
+ALTER TABLE students ALTER COLUMN program_id SET NOT NULL;
+ALTER TABLE students ADD CONSTRAINT students_program_id_fkey
+    FOREIGN KEY (program_id) REFERENCES programs(id) ON DELETE RESTRICT;
+ALTER TABLE students DROP COLUMN program_code;
+
+CREATE INDEX IF NOT EXISTS idx_students_program ON students(program_id);
+CREATE INDEX IF NOT EXISTS idx_programs_college ON programs(college_id);
+
+-- Search haystack without the program code (a generated column cannot read
+-- programs); "all" searches match program codes through programs instead
+ALTER TABLE students ADD COLUMN search_text TEXT
+    GENERATED ALWAYS AS (
+        UPPER(student_id || ' ' || first_name || ' ' || last_name || ' ' ||
+              gender || ' ' || year_level::text)
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_students_search_trgm ON students USING gin (search_text gin_trgm_ops);
+
+-- Dashboard statistics over the new keys (same columns as migration 0006)
+CREATE MATERIALIZED VIEW student_stats AS
+SELECT
+    c.college_code,
+    c.college_name,
+    p.program_code,
+    p.program_name,
+    s.year_level,
+    s.gender,
+    COUNT(s.student_id) AS student_count
+FROM programs p
+JOIN colleges c ON c.id = p.college_id
+LEFT JOIN students s ON s.program_id = p.id
+GROUP BY c.college_code, c.college_name, p.program_code, p.program_name, s.year_level, s.gender;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_student_stats_key
+    ON student_stats (program_code, year_level, gender);
+
+-- The rebuilt view is current as of now
+UPDATE table_versions SET version = (
+    SELECT COALESCE(SUM(version), 0) FROM table_versions
+    WHERE table_name IN ('colleges', 'programs', 'students')
+)
+WHERE table_name = 'student_stats';
@@ -0,0 +1,38 @@
+-- The N/A college and program are where dependants go when their parent is
+-- deleted. Make sure they exist and cannot be deleted or renamed, so deletes
+-- can reassign to them inside a single statement without probing first.
+
+INSERT INTO colleges (college_code, college_name) VALUES ('N/A', 'No College Assigned')
+ON CONFLICT (college_code) DO NOTHING;
+
+INSERT INTO programs (program_code, program_name, college_id)
+SELECT 'N/A', 'No Program Assigned', id FROM colleges WHERE college_code = 'N/A'
+ON CONFLICT (program_code) DO NOTHING;
+
+-- TG_ARGV[0] is the code column; the error carries TG_ARGV[1] as its constraint
+-- name so the application can map it to a message
+CREATE OR REPLACE FUNCTION protect_sentinel_row() RETURNS trigger AS $$
+BEGIN
+    IF to_jsonb(OLD) ->> TG_ARGV[0] = 'N/A'
+       AND (TG_OP = 'DELETE' OR to_jsonb(NEW) ->> TG_ARGV[0] IS DISTINCT FROM 'N/A') THEN
+        -- No format placeholders: migrations go through the driver's paramstyle
+        RAISE EXCEPTION USING
+            MESSAGE = 'The N/A row of ' || TG_TABLE_NAME || ' cannot be deleted or renamed',
+            ERRCODE = 'check_violation', CONSTRAINT = TG_ARGV[1];
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS colleges_protect_sentinel ON colleges;
+CREATE TRIGGER colleges_protect_sentinel
+    BEFORE UPDATE OF college_code OR DELETE ON colleges
+    FOR EACH ROW EXECUTE FUNCTION protect_sentinel_row('college_code', 'colleges_na_sentinel');
+
+DROP TRIGGER IF EXISTS programs_protect_sentinel ON programs;
+CREATE TRIGGER programs_protect_sentinel
+    BEFORE UPDATE OF program_code OR DELETE ON programs
+    FOR EACH ROW EXECUTE FUNCTION protect_sentinel_row('program_code', 'programs_na_sentinel');
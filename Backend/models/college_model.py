@@ -1,4 +1,25 @@
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from utils.cache import get_cache, make_key
+from utils.db_errors import ConflictError, ConstraintError, NotFoundError, raise_for_integrity
+from utils.pagination import normalize_sort, keyset_condition, keyset_order, build_page
+
+
+# Sortable columns mapped to the response key that carries their value
+SORTABLE_COLUMNS = {
+    "college_code": "code",
+    "college_name": "name",
+}
+
+# Sentinel college that programs of a deleted college move to; migration 0009
+# guarantees it exists and cannot be deleted or renamed
+NA_COLLEGE_CODE = "N/A"
+
+# User-facing messages for constraint violations on writes
+WRITE_ERROR_MESSAGES = {
+    "colleges_college_code_key": "College code already exists",
+    "colleges_na_sentinel": "The N/A college cannot be renamed or deleted",
+}
 
 
 class CollegeModel:
@@ -6,44 +27,77 @@ class CollegeModel:
     
     def __init__(self, engine):
         self.engine = engine
+        self.cache = get_cache("colleges")
+        # Program rows show their college's code, so college renames/deletes affect them too
+        self.program_cache = get_cache("programs")
+
+    def _invalidate_caches(self):
+        self.cache.invalidate()
+        self.program_cache.invalidate()
+
+    def _build_filters(self, search=None, search_field='all'):
+        """Build WHERE clauses and params shared by the listing queries"""
+        where_clauses = []
+        params = {}
+
+        if search:
+            if search_field == 'code':
+                where_clauses.append("LOWER(college_code) LIKE LOWER(:search)")
+            elif search_field == 'name':
+                where_clauses.append("LOWER(college_name) LIKE LOWER(:search)")
+            else:  # all fields
+                where_clauses.append("(LOWER(college_code) LIKE LOWER(:search) OR LOWER(college_name) LIKE LOWER(:search))")
+            params["search"] = f"%{search}%"
+
+        return where_clauses, params
+
+    def get_all(self, sort='asc', sort_by='college_code', search=None, search_field='all', versions=None):
+        """Fetch all colleges with optional search and sort (cached per table versions)"""
+        sort, sort_by = normalize_sort(sort, sort_by, SORTABLE_COLUMNS)
+        key = make_key("all", sort, sort_by, search, search_field, versions)
+        return self.cache.get_or_load(key, lambda: self._query_all(sort, sort_by, search, search_field))
+
+    def _query_all(self, sort, sort_by, search, search_field):
+        where_clauses, params = self._build_filters(search, search_field)
 
-    def get_all(self, sort='asc', sort_by='college_code', search=None, search_field='all'):
-        """Fetch all colleges with optional search and sort"""
         with self.engine.connect() as conn:
-            if search:
-                if search_field == 'code':
-                    query = text(f"""
-                        SELECT college_code, college_name
-                        FROM colleges
-                        WHERE LOWER(college_code) LIKE LOWER(:search)
-                        ORDER BY {sort_by} {sort.upper()}
-                    """)
-                elif search_field == 'name':
-                    query = text(f"""
-                        SELECT college_code, college_name
-                        FROM colleges
-                        WHERE LOWER(college_name) LIKE LOWER(:search)
-                        ORDER BY {sort_by} {sort.upper()}
-                    """)
-                else:  # all fields
-                    query = text(f"""
-                        SELECT college_code, college_name
-                        FROM colleges
-                        WHERE LOWER(college_code) LIKE LOWER(:search)
-                           OR LOWER(college_name) LIKE LOWER(:search)
-                        ORDER BY {sort_by} {sort.upper()}
-                    """)
-                result = conn.execute(query, {"search": f"%{search}%"})
-            else:
-                query = text(f"""
-                    SELECT college_code, college_name
-                    FROM colleges
-                    ORDER BY {sort_by} {sort.upper()}
-                """)
-                result = conn.execute(query)
+            where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+            query = text(f"""
+                SELECT college_code, college_name
+                FROM colleges
+                WHERE {where_sql}
+                ORDER BY {sort_by} {sort.upper()}
+            """)
+            result = conn.execute(query, params)
             
             return [{"code": row[0], "name": row[1]} for row in result]
 
+    def get_page(self, sort='asc', sort_by='college_code', search=None, search_field='all', limit=50, after=None, versions=None):
+        """Fetch one page of colleges using keyset pagination on (sort_by, college_code) (cached per table versions)"""
+        sort, sort_by = normalize_sort(sort, sort_by, SORTABLE_COLUMNS)
+        key = make_key("page", sort, sort_by, search, search_field, limit, after, versions)
+        return self.cache.get_or_load(key, lambda: self._query_page(sort, sort_by, search, search_field, limit, after))
+
+    def _query_page(self, sort, sort_by, search, search_field, limit, after):
+        where_clauses, params = self._build_filters(search, search_field)
+
+        if after:
+            where_clauses.append(keyset_condition(sort_by, "college_code", sort, after, params))
+        params["limit"] = limit + 1
+
+        with self.engine.connect() as conn:
+            where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+            query = text(f"""
+                SELECT college_code, college_name
+                FROM colleges
+                WHERE {where_sql}
+                ORDER BY {keyset_order(sort_by, "college_code", sort)}
+                LIMIT :limit
+            """)
+            items = [{"code": row[0], "name": row[1]} for row in conn.execute(query, params)]
+
+        return build_page(items, limit, sort_by, sort, SORTABLE_COLUMNS[sort_by], "code")
+
     def get_by_code(self, college_code):
         """Get a single college by code"""
         with self.engine.connect() as conn:
@@ -58,45 +112,82 @@ class CollegeModel:
         return self.get_by_code(college_code) is not None
 
     def create(self, college_code, college_name):
-        """Create a new college"""
+        """Create a new college in one statement. Raises ConflictError."""
         with self.engine.connect() as conn:
-            conn.execute(
-                text("INSERT INTO colleges (college_code, college_name) VALUES (:code, :name)"),
+            created = conn.execute(
+                text("""
+                    INSERT INTO colleges (college_code, college_name) VALUES (:code, :name)
+                    ON CONFLICT (college_code) DO NOTHING
+                    RETURNING college_code
+                """),
                 {"code": college_code, "name": college_name}
-            )
+            ).fetchone()
+            if created is None:
+                raise ConflictError("College code already exists")
             conn.commit()
+        self._invalidate_caches()
 
     def update(self, old_code, new_code, college_name):
-        """Update a college"""
+        """
+        Update a college in one statement. Programs reference the college's id, so a
+        code change touches only this row. Raises NotFoundError / ConflictError.
+        """
         with self.engine.connect() as conn:
-            conn.execute(
-                text("UPDATE colleges SET college_code = :new_code, college_name = :name WHERE college_code = :old_code"),
-                {"old_code": old_code, "new_code": new_code, "name": college_name}
-            )
+            try:
+                updated = conn.execute(
+                    text("""
+                        UPDATE colleges SET college_code = :new_code, college_name = :name
+                        WHERE college_code = :old_code
+                        RETURNING college_code
+                    """),
+                    {"old_code": old_code, "new_code": new_code, "name": college_name}
+                ).fetchone()
+            except IntegrityError as e:
+                raise_for_integrity(e, {**WRITE_ERROR_MESSAGES, "colleges_college_code_key": "New college code already exists"})
+            if updated is None:
+                raise NotFoundError("College not found")
             conn.commit()
+        self._invalidate_caches()
 
     def delete(self, college_code):
-        """Delete a college and reassign programs to N/A"""
+        """Delete a college and reassign its programs to the N/A college. Raises NotFoundError."""
+        deleted, _ = self.delete_many([college_code])
+        if not deleted:
+            raise NotFoundError("College not found")
+
+    def delete_many(self, college_codes):
+        """
+        Delete colleges and reassign their programs to the N/A college in one
+        statement. Returns (deleted_codes, reassigned_program_count). Raises
+        ConstraintError if the N/A college itself is listed.
+        """
+        if NA_COLLEGE_CODE in college_codes:
+            raise ConstraintError("The N/A college cannot be deleted")
+
         with self.engine.connect() as conn:
-            # Ensure N/A college exists
-            na_exists = conn.execute(
-                text("SELECT 1 FROM colleges WHERE college_code = 'N/A'")
-            ).fetchone()
-            
-            if not na_exists:
-                conn.execute(
-                    text("INSERT INTO colleges (college_code, college_name) VALUES ('N/A', 'No College Assigned')")
-                )
-            
-            # Reassign programs
-            conn.execute(
-                text("UPDATE programs SET college_code = 'N/A' WHERE college_code = :code"),
-                {"code": college_code}
-            )
-            
-            # Delete college
-            conn.execute(
-                text("DELETE FROM colleges WHERE college_code = :code"),
-                {"code": college_code}
-            )
+            try:
+                deleted, reassigned = conn.execute(
+                    text("""
+                        WITH doomed AS (
+                            SELECT id FROM colleges WHERE college_code = ANY(:codes) FOR UPDATE
+                        ),
+                        reassigned AS (
+                            UPDATE programs
+                            SET college_id = (SELECT id FROM colleges WHERE college_code = :na)
+                            WHERE college_id IN (SELECT id FROM doomed)
+                            RETURNING 1
+                        ),
+                        deleted AS (
+                            DELETE FROM colleges WHERE id IN (SELECT id FROM doomed)
+                            RETURNING college_code
+                        )
+                        SELECT ARRAY(SELECT college_code FROM deleted), (SELECT COUNT(*) FROM reassigned)
+                    """),
+                    {"codes": list(college_codes), "na": NA_COLLEGE_CODE}
+                ).one()
+            except IntegrityError as e:
+                raise_for_integrity(e, WRITE_ERROR_MESSAGES, deleting=True)
             conn.commit()
+        if deleted:
+            self._invalidate_caches()
+        return deleted, reassigned
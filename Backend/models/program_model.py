@@ -1,4 +1,33 @@
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from utils.cache import get_cache, make_key
+from utils.db_errors import ConflictError, ConstraintError, NotFoundError, raise_for_integrity
+from utils.pagination import normalize_sort, keyset_condition, keyset_order, build_page
+
+
+# Sortable columns mapped to the response key that carries their value
+SORTABLE_COLUMNS = {
+    "program_code": "code",
+    "program_name": "name",
+    "college_code": "collegeCode",
+}
+
+# Listing source: programs reference colleges by id, the API speaks college codes
+PROGRAMS_FROM = "programs JOIN colleges ON colleges.id = programs.college_id"
+
+# Resolves a college code to its id; NULL (rejected by NOT NULL) when unknown
+COLLEGE_ID_SQL = "(SELECT id FROM colleges WHERE college_code = :college)"
+
+# Sentinel program that students of a bulk-deleted program move to; migration 0009
+# guarantees it exists and cannot be deleted or renamed
+NA_PROGRAM_CODE = "N/A"
+
+# User-facing messages for constraint violations on writes
+WRITE_ERROR_MESSAGES = {
+    "programs_program_code_key": "Program code already exists",
+    "college_id": "College code does not exist",
+    "programs_na_sentinel": "The N/A program cannot be renamed or deleted",
+}
 
 
 class ProgramModel:
@@ -6,38 +35,49 @@ class ProgramModel:
     
     def __init__(self, engine):
         self.engine = engine
+        self.cache = get_cache("programs")
+
+    def _build_filters(self, search=None, search_field='all', colleges=None):
+        """Build WHERE clauses and params shared by the listing queries"""
+        where_clauses = []
+        params = {}
+        
+        # Add search filter
+        if search:
+            if search_field == 'code':
+                where_clauses.append("LOWER(program_code) LIKE LOWER(:search)")
+            elif search_field == 'name':
+                where_clauses.append("LOWER(program_name) LIKE LOWER(:search)")
+            elif search_field == 'collegeCode':
+                where_clauses.append("LOWER(college_code) LIKE LOWER(:search)")
+            else:  # all fields
+                where_clauses.append("(LOWER(program_code) LIKE LOWER(:search) OR LOWER(program_name) LIKE LOWER(:search))")
+            params["search"] = f"%{search}%"
+        
+        # Add college filter
+        if colleges and len(colleges) > 0:
+            placeholders = ', '.join([f':college_{i}' for i in range(len(colleges))])
+            where_clauses.append(f"college_code IN ({placeholders})")
+            for i, college in enumerate(colleges):
+                params[f'college_{i}'] = college
+
+        return where_clauses, params
+
+    def get_all(self, sort='asc', sort_by='program_code', search=None, search_field='all', colleges=None, versions=None):
+        """Fetch all programs with optional search, sort, and filters (cached per table versions)"""
+        sort, sort_by = normalize_sort(sort, sort_by, SORTABLE_COLUMNS)
+        key = make_key("all", sort, sort_by, search, search_field, colleges, versions)
+        return self.cache.get_or_load(key, lambda: self._query_all(sort, sort_by, search, search_field, colleges))
+
+    def _query_all(self, sort, sort_by, search, search_field, colleges):
+        where_clauses, params = self._build_filters(search, search_field, colleges)
 
-    def get_all(self, sort='asc', sort_by='program_code', search=None, search_field='all', colleges=None):
-        """Fetch all programs with optional search, sort, and filters"""
         with self.engine.connect() as conn:
-            # Build WHERE clauses
-            where_clauses = []
-            params = {}
-            
-            # Add search filter
-            if search:
-                if search_field == 'code':
-                    where_clauses.append("LOWER(program_code) LIKE LOWER(:search)")
-                elif search_field == 'name':
-                    where_clauses.append("LOWER(program_name) LIKE LOWER(:search)")
-                elif search_field == 'collegeCode':
-                    where_clauses.append("LOWER(college_code) LIKE LOWER(:search)")
-                else:  # all fields
-                    where_clauses.append("(LOWER(program_code) LIKE LOWER(:search) OR LOWER(program_name) LIKE LOWER(:search))")
-                params["search"] = f"%{search}%"
-            
-            # Add college filter
-            if colleges and len(colleges) > 0:
-                placeholders = ', '.join([f':college_{i}' for i in range(len(colleges))])
-                where_clauses.append(f"college_code IN ({placeholders})")
-                for i, college in enumerate(colleges):
-                    params[f'college_{i}'] = college
-            
             # Query 
             where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
             query = text(f"""
                 SELECT program_code, program_name, college_code
-                FROM programs
+                FROM {PROGRAMS_FROM}
                 WHERE {where_sql}
                 ORDER BY {sort_by} {sort.upper()}
             """)
@@ -45,11 +85,37 @@ class ProgramModel:
             result = conn.execute(query, params)
             return [{"code": row[0], "name": row[1], "collegeCode": row[2]} for row in result]
 
+    def get_page(self, sort='asc', sort_by='program_code', search=None, search_field='all', colleges=None, limit=50, after=None, versions=None):
+        """Fetch one page of programs using keyset pagination on (sort_by, program_code) (cached per table versions)"""
+        sort, sort_by = normalize_sort(sort, sort_by, SORTABLE_COLUMNS)
+        key = make_key("page", sort, sort_by, search, search_field, colleges, limit, after, versions)
+        return self.cache.get_or_load(key, lambda: self._query_page(sort, sort_by, search, search_field, colleges, limit, after))
+
+    def _query_page(self, sort, sort_by, search, search_field, colleges, limit, after):
+        where_clauses, params = self._build_filters(search, search_field, colleges)
+
+        if after:
+            where_clauses.append(keyset_condition(sort_by, "program_code", sort, after, params))
+        params["limit"] = limit + 1
+
+        with self.engine.connect() as conn:
+            where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+            query = text(f"""
+                SELECT program_code, program_name, college_code
+                FROM {PROGRAMS_FROM}
+                WHERE {where_sql}
+                ORDER BY {keyset_order(sort_by, "program_code", sort)}
+                LIMIT :limit
+            """)
+            items = [{"code": row[0], "name": row[1], "collegeCode": row[2]} for row in conn.execute(query, params)]
+
+        return build_page(items, limit, sort_by, sort, SORTABLE_COLUMNS[sort_by], "code")
+
     def get_by_code(self, program_code):
         """Get a single program by code"""
         with self.engine.connect() as conn:
             result = conn.execute(
-                text("SELECT program_code, college_code FROM programs WHERE program_code = :code"),
+                text(f"SELECT program_code, college_code FROM {PROGRAMS_FROM} WHERE program_code = :code"),
                 {"code": program_code}
             ).fetchone()
             return result
@@ -58,53 +124,97 @@ class ProgramModel:
         """Check if program exists"""
         return self.get_by_code(program_code) is not None
 
-    def college_exists(self, college_code):
-        """Check if college exists"""
-        with self.engine.connect() as conn:
-            result = conn.execute(
-                text("SELECT 1 FROM colleges WHERE college_code = :code"),
-                {"code": college_code}
-            ).fetchone()
-            return result is not None
-
     def create(self, program_code, program_name, college_code):
-        """Create a new program"""
+        """Create a new program in one statement. Raises ConflictError / ConstraintError."""
         with self.engine.connect() as conn:
-            conn.execute(
-                text("INSERT INTO programs (program_code, program_name, college_code) VALUES (:code, :name, :college)"),
-                {"code": program_code, "name": program_name, "college": college_code}
-            )
+            try:
+                created = conn.execute(
+                    text(f"""
+                        INSERT INTO programs (program_code, program_name, college_id) VALUES (:code, :name, {COLLEGE_ID_SQL})
+                        ON CONFLICT (program_code) DO NOTHING
+                        RETURNING program_code
+                    """),
+                    {"code": program_code, "name": program_name, "college": college_code}
+                ).fetchone()
+            except IntegrityError as e:
+                raise_for_integrity(e, WRITE_ERROR_MESSAGES)
+            if created is None:
+                raise ConflictError("Program code already exists")
             conn.commit()
+        self.cache.invalidate()
 
     def update(self, old_code, new_code, program_name, college_code):
-        """Update a program"""
+        """
+        Update a program in one statement. Students reference the program's id, so a
+        code change touches only this row. Raises NotFoundError / ConflictError / ConstraintError.
+        """
         with self.engine.connect() as conn:
-            # Get old college code
-            old_college = conn.execute(
-                text("SELECT college_code FROM programs WHERE program_code = :code"),
-                {"code": old_code}
-            ).fetchone()
-            
-            # Update program
-            conn.execute(
-                text("UPDATE programs SET program_code = :new_code, program_name = :name, college_code = :college WHERE program_code = :old_code"),
-                {"old_code": old_code, "new_code": new_code, "name": program_name, "college": college_code}
-            )
-            
-            # Update students if program code changed
-            if old_code != new_code:
-                conn.execute(
-                    text("UPDATE students SET program_code = :new_code WHERE program_code = :old_code"),
-                    {"old_code": old_code, "new_code": new_code}
-                )
-            
+            try:
+                updated = conn.execute(
+                    text(f"""
+                        UPDATE programs SET program_code = :new_code, program_name = :name, college_id = {COLLEGE_ID_SQL}
+                        WHERE program_code = :old_code
+                        RETURNING program_code
+                    """),
+                    {"old_code": old_code, "new_code": new_code, "name": program_name, "college": college_code}
+                ).fetchone()
+            except IntegrityError as e:
+                raise_for_integrity(e, {**WRITE_ERROR_MESSAGES, "programs_program_code_key": "New program code already exists"})
+            if updated is None:
+                raise NotFoundError("Program not found")
             conn.commit()
+        self.cache.invalidate()
 
     def delete(self, program_code):
-        """Delete a program"""
+        """Delete a program. Raises NotFoundError, or ConflictError while students are enrolled."""
         with self.engine.connect() as conn:
-            conn.execute(
-                text("DELETE FROM programs WHERE program_code = :code"),
-                {"code": program_code}
-            )
+            try:
+                deleted = conn.execute(
+                    text("DELETE FROM programs WHERE program_code = :code RETURNING program_code"),
+                    {"code": program_code}
+                ).fetchone()
+            except IntegrityError as e:
+                raise_for_integrity(
+                    e, {**WRITE_ERROR_MESSAGES, "students_program_id_fkey": "Program still has students assigned"}, deleting=True
+                )
+            if deleted is None:
+                raise NotFoundError("Program not found")
+            conn.commit()
+        self.cache.invalidate()
+
+    def delete_many(self, program_codes):
+        """
+        Delete programs and reassign their students to the N/A program in one
+        statement. Returns (deleted_codes, reassigned_student_count). Raises
+        ConstraintError if the N/A program itself is listed.
+        """
+        if NA_PROGRAM_CODE in program_codes:
+            raise ConstraintError("The N/A program cannot be deleted")
+
+        with self.engine.connect() as conn:
+            try:
+                deleted, reassigned = conn.execute(
+                    text("""
+                        WITH doomed AS (
+                            SELECT id FROM programs WHERE program_code = ANY(:codes) FOR UPDATE
+                        ),
+                        reassigned AS (
+                            UPDATE students
+                            SET program_id = (SELECT id FROM programs WHERE program_code = :na)
+                            WHERE program_id IN (SELECT id FROM doomed)
+                            RETURNING 1
+                        ),
+                        deleted AS (
+                            DELETE FROM programs WHERE id IN (SELECT id FROM doomed)
+                            RETURNING program_code
+                        )
+                        SELECT ARRAY(SELECT program_code FROM deleted), (SELECT COUNT(*) FROM reassigned)
+                    """),
+                    {"codes": list(program_codes), "na": NA_PROGRAM_CODE}
+                ).one()
+            except IntegrityError as e:
+                raise_for_integrity(e, WRITE_ERROR_MESSAGES, deleting=True)
             conn.commit()
+        if deleted:
+            self.cache.invalidate()
+        return deleted, reassigned
@@ -0,0 +1,74 @@
+import os
+from sqlalchemy import text
+from utils.jobs import periodic_task
+
+
+STATS_SOURCE_TABLES = ("colleges", "programs", "students")
+STATS_REFRESH_INTERVAL = float(os.getenv("STATS_REFRESH_INTERVAL", "30"))
+# Keeps workers in different processes from refreshing the view at the same time
+STATS_REFRESH_LOCK_ID = 181002
+
+
+class StatsModel:
+    """Model for aggregate student headcounts (student_stats materialized view)"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def get_rows(self):
+        """Return every row of the view as dicts"""
+        with self.engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT college_code, college_name, program_code, program_name, year_level, gender, student_count
+                FROM student_stats
+                ORDER BY college_code, program_code, year_level, gender
+            """))
+            return [
+                {
+                    "college": row[0],
+                    "collegeName": row[1],
+                    "program": row[2],
+                    "programName": row[3],
+                    "yearLevel": row[4],
+                    "gender": row[5],
+                    "count": row[6],
+                }
+                for row in result
+            ]
+
+    def refresh_if_stale(self):
+        """
+        Refresh the view if the source tables changed since the last refresh.
+        Returns True if a refresh ran, False if it was current or another worker holds the lock.
+        """
+        with self.engine.connect() as conn:
+            locked = conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(:lock_id)"),
+                {"lock_id": STATS_REFRESH_LOCK_ID}
+            ).scalar()
+            if not locked:
+                conn.rollback()
+                return False
+
+            versions = dict(conn.execute(
+                text("SELECT table_name, version FROM table_versions WHERE table_name = ANY(:tables)"),
+                {"tables": list(STATS_SOURCE_TABLES) + ["student_stats"]}
+            ).fetchall())
+            source_version = sum(versions.get(t, 0) for t in STATS_SOURCE_TABLES)
+            if versions.get("student_stats") == source_version:
+                conn.rollback()
+                return False
+
+            conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY student_stats"))
+            conn.execute(
+                text("UPDATE table_versions SET version = :version WHERE table_name = 'student_stats'"),
+                {"version": source_version}
+            )
+            conn.commit()
+            return True
+
+
+@periodic_task(STATS_REFRESH_INTERVAL)
+def refresh_student_stats(engine):
+    if StatsModel(engine).refresh_if_stale():
+        print("[OK] Refreshed student_stats")
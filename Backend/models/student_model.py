@@ -1,4 +1,56 @@
+import csv
+import io
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from utils.db_errors import ConflictError, NotFoundError, raise_for_integrity
+from utils.jobs import enqueue, enqueue_many, notify_workers
+from utils.storage import object_path
+from utils.student_import import VALID_GENDERS
+from utils.thumbnails import thumbnail_url
+from utils.pagination import normalize_sort, keyset_condition, keyset_order, build_page
+
+
+# Sortable columns mapped to the response key that carries their value
+SORTABLE_COLUMNS = {
+    "student_id": "id",
+    "first_name": "firstName",
+    "last_name": "lastName",
+    "gender": "gender",
+    "program_code": "course",
+    "year_level": "yearLevel",
+}
+
+# Response keys, in the order _to_row returns values
+RESPONSE_COLUMNS = ("id", "firstName", "lastName", "gender", "course", "yearLevel", "profileImage", "thumbnail", "thumbnailJpeg")
+
+# Shortest term the trigram index can serve; shorter terms use prefix indexes
+MIN_TRIGRAM_LENGTH = 3
+
+# Listing source: students reference programs by id, the API speaks program codes
+STUDENTS_FROM = "students JOIN programs ON programs.id = students.program_id"
+
+# Resolves a program code to its id; NULL (rejected by NOT NULL) when unknown
+PROGRAM_ID_SQL = "(SELECT id FROM programs WHERE program_code = :{param})"
+
+# User-facing messages for constraint violations on single-row writes
+WRITE_ERROR_MESSAGES = {
+    "students_pkey": "Student ID already exists",
+    "program_id": "Program code does not exist",
+    "students_gender_check": "Gender must be one of M, F, Others",
+    "students_year_level_check": "Year level must be between 1 and 5",
+}
+
+# Fields a batch update may change, and the filters a batch mutation accepts
+BATCH_UPDATE_FIELDS = ("first_name", "last_name", "gender", "program_code", "year_level")
+BATCH_FILTER_COLUMNS = {
+    "student_ids": "student_id",
+    "program_codes": "program_id",
+    "year_levels": "year_level",
+    "genders": "gender",
+}
+
+# Rows fetched per round trip when streaming through a server-side cursor
+STREAM_BATCH_SIZE = 1000
 
 
 class StudentModel:
@@ -7,97 +59,266 @@ class StudentModel:
     def __init__(self, engine):
         self.engine = engine
 
-    def get_all(self, sort='asc', sort_by='student_id', search=None, search_field='all', genders=None, year_levels=None, programs=None):
-        """Fetch all students with optional search, sort, and filters"""
-        with self.engine.connect() as conn:
-            # Build WHERE clauses
-            where_clauses = []
-            params = {}
-            
-            # Add search filter
-            if search:
-                search_stripped = search.strip()
-                search_upper = search_stripped.upper()
-                
-                if search_field == 'id':
-                    search_numbers = ''.join(filter(str.isdigit, search_stripped))
-                    if not search_numbers:
-                        return []
-                    where_clauses.append("student_id LIKE :search")
-                    params["search"] = f"%{search_numbers}%"
-                elif search_field == 'first_name':
-                    where_clauses.append("UPPER(first_name) LIKE :search")
-                    params["search"] = f"{search_upper}%"
-                elif search_field == 'last_name':
-                    where_clauses.append("UPPER(last_name) LIKE :search")
-                    params["search"] = f"{search_upper}%"
-                elif search_field == 'gender':
-                    where_clauses.append("UPPER(gender) LIKE :search")
-                    params["search"] = f"{search_upper}%"
-                elif search_field == 'course':
-                    where_clauses.append("UPPER(program_code) LIKE :search")
-                    params["search"] = f"{search_upper}%"
-                elif search_field == 'year_level':
-                    where_clauses.append("CAST(year_level AS TEXT) LIKE :search")
-                    params["search"] = f"{search_stripped}%"
-                else:  # all fields
-                    where_clauses.append("""(student_id LIKE :search
-                        OR UPPER(first_name) LIKE :search_upper
-                        OR UPPER(last_name) LIKE :search_upper
-                        OR UPPER(gender) LIKE :search_upper
-                        OR UPPER(program_code) LIKE :search_upper
-                        OR CAST(year_level AS TEXT) LIKE :search)""")
-                    params["search"] = f"%{search_stripped}%"
-                    params["search_upper"] = f"{search_upper}%"
+    def _build_filters(self, search=None, search_field='all', genders=None, year_levels=None, programs=None):
+        """Build WHERE clauses and params shared by the listing queries.
+        Returns None when the search can never match."""
+        where_clauses = []
+        params = {}
+        
+        # Add search filter
+        if search:
+            search_stripped = search.strip()
+            search_upper = search_stripped.upper()
             
-            # Add gender filter
-            if genders and len(genders) > 0:
-                placeholders = ', '.join([f':gender_{i}' for i in range(len(genders))])
-                where_clauses.append(f"gender IN ({placeholders})")
-                for i, gender in enumerate(genders):
-                    params[f'gender_{i}'] = gender
-            
-            # Add year level filter
-            if year_levels and len(year_levels) > 0:
-                placeholders = ', '.join([f':year_{i}' for i in range(len(year_levels))])
-                where_clauses.append(f"year_level IN ({placeholders})")
-                for i, year in enumerate(year_levels):
-                    params[f'year_{i}'] = int(year)
-            
-            # Add program filter
-            if programs and len(programs) > 0:
-                placeholders = ', '.join([f':program_{i}' for i in range(len(programs))])
-                where_clauses.append(f"program_code IN ({placeholders})")
-                for i, program in enumerate(programs):
-                    params[f'program_{i}'] = program
-            
-            # Query
+            if search_field == 'id':
+                search_numbers = ''.join(filter(str.isdigit, search_stripped))
+                if not search_numbers:
+                    return None
+                where_clauses.append("student_id LIKE :search")
+                params["search"] = f"%{search_numbers}%"
+            elif search_field == 'first_name':
+                where_clauses.append("UPPER(first_name) LIKE :search")
+                params["search"] = f"{search_upper}%"
+            elif search_field == 'last_name':
+                where_clauses.append("UPPER(last_name) LIKE :search")
+                params["search"] = f"{search_upper}%"
+            elif search_field == 'gender':
+                where_clauses.append("UPPER(gender) LIKE :search")
+                params["search"] = f"{search_upper}%"
+            elif search_field == 'course':
+                where_clauses.append("UPPER(program_code) LIKE :search")
+                params["search"] = f"{search_upper}%"
+            elif search_field == 'year_level':
+                where_clauses.append("CAST(year_level AS TEXT) LIKE :search")
+                params["search"] = f"{search_stripped}%"
+            elif len(search_stripped) < MIN_TRIGRAM_LENGTH:  # all fields, too short for trigrams
+                # Prefix matches on the indexed columns; gender and year level are
+                # resolved to the values they can match and compared for equality
+                conditions = [
+                    "student_id LIKE :search",
+                    "UPPER(first_name) LIKE :search",
+                    "UPPER(last_name) LIKE :search",
+                ]
+                params["search"] = f"{search_upper}%"
+                # Program ids are resolved first so the planner sees real values and
+                # can OR the indexes together instead of walking the whole table
+                program_ids = self._program_ids_like(params["search"])
+                if program_ids:
+                    conditions.append("program_id = ANY(:search_programs)")
+                    params["search_programs"] = program_ids
+                matching_genders = [g for g in VALID_GENDERS if g.upper().startswith(search_upper)]
+                if matching_genders:
+                    conditions.append("gender = ANY(:search_genders)")
+                    params["search_genders"] = matching_genders
+                if len(search_stripped) == 1 and search_stripped.isdigit():  # year levels are one digit
+                    conditions.append("year_level = :search_year")
+                    params["search_year"] = int(search_stripped)
+                where_clauses.append(f"({' OR '.join(conditions)})")
+            else:  # all fields; program codes live in programs, matched through their ids
+                where_clauses.append("""(search_text LIKE :search
+                    OR program_id = ANY(ARRAY(SELECT id FROM programs WHERE UPPER(program_code) LIKE :search)))""")
+                params["search"] = f"%{search_upper}%"
+                params["search_term"] = search_upper
+        
+        # Add gender filter
+        if genders and len(genders) > 0:
+            placeholders = ', '.join([f':gender_{i}' for i in range(len(genders))])
+            where_clauses.append(f"gender IN ({placeholders})")
+            for i, gender in enumerate(genders):
+                params[f'gender_{i}'] = gender
+        
+        # Add year level filter
+        if year_levels and len(year_levels) > 0:
+            placeholders = ', '.join([f':year_{i}' for i in range(len(year_levels))])
+            where_clauses.append(f"year_level IN ({placeholders})")
+            for i, year in enumerate(year_levels):
+                params[f'year_{i}'] = int(year)
+        
+        # Add program filter
+        if programs and len(programs) > 0:
+            placeholders = ', '.join([f':program_{i}' for i in range(len(programs))])
+            where_clauses.append(f"program_code IN ({placeholders})")
+            for i, program in enumerate(programs):
+                params[f'program_{i}'] = program
+
+        return where_clauses, params
+
+    def _program_ids_like(self, pattern):
+        """Ids of programs whose upper-cased code matches a LIKE pattern"""
+        with self.engine.connect() as conn:
+            result = conn.execute(text("SELECT id FROM programs WHERE UPPER(program_code) LIKE :pattern"), {"pattern": pattern})
+            return [row[0] for row in result]
+
+    @staticmethod
+    def _to_row(row):
+        """Listing row as a tuple of RESPONSE_COLUMNS values"""
+        thumb_key = row[7] if row[6] else None
+        return (row[0], row[1], row[2], row[3], row[4], row[5], row[6],
+                thumbnail_url(thumb_key), thumbnail_url(thumb_key, ext="jpg"))
+
+    @classmethod
+    def _to_dict(cls, row):
+        return dict(zip(RESPONSE_COLUMNS, cls._to_row(row)))
+
+    def _list_query(self, sort, sort_by, search, search_field, genders, year_levels, programs):
+        """Build the full listing query, or None when the search can never match"""
+        filters = self._build_filters(search, search_field, genders, year_levels, programs)
+        if filters is None:
+            return None
+        where_clauses, params = filters
+
+        if sort_by == 'relevance':
+            # Rank by trigram similarity when there is a term to rank against
+            if "search_term" in params:
+                order_sql = "similarity(search_text, :search_term) DESC, student_id ASC"
+            else:
+                order_sql = "student_id ASC"
+        else:
+            sort, sort_by = normalize_sort(sort, sort_by, SORTABLE_COLUMNS)
+            order_sql = f"{sort_by} {sort.upper()}"
+
+        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+        query = text(f"""
+            SELECT student_id, first_name, last_name, gender, program_code, year_level, profile_image_url, profile_thumb_key
+            FROM {STUDENTS_FROM}
+            WHERE {where_sql}
+            ORDER BY {order_sql}
+        """)
+        return query, params
+
+    def get_rows(self, sort='asc', sort_by='student_id', search=None, search_field='all', genders=None, year_levels=None, programs=None):
+        """Fetch all students with optional search, sort, and filters as RESPONSE_COLUMNS tuples"""
+        built = self._list_query(sort, sort_by, search, search_field, genders, year_levels, programs)
+        if built is None:
+            return []
+        query, params = built
+        with self.engine.connect() as conn:
+            # Fetch all rows while connection is still open
+            return [self._to_row(row) for row in conn.execute(query, params)]
+
+    def get_facets(self, search=None, search_field='all', genders=None, year_levels=None, programs=None):
+        """
+        Count matches per gender, year level and program for the current search in one scan.
+        Each facet is counted with every filter except its own, so the counts show
+        what selecting another option would return. `total` applies all filters.
+        """
+        empty = {"total": 0, "genders": {}, "yearLevels": {}, "programs": {}}
+        search_filters = self._build_filters(search, search_field)
+        if search_filters is None:
+            return empty
+        where_clauses, params = search_filters
+
+        # Each filter builds its own placeholders (gender_i / year_i / program_i), so params never clash
+        conditions = {}
+        for name, kwargs in (("gender", {"genders": genders}),
+                             ("year", {"year_levels": year_levels}),
+                             ("program", {"programs": programs})):
+            clauses, filter_params = self._build_filters(**kwargs)
+            conditions[name] = " AND ".join(clauses) if clauses else "TRUE"
+            params.update(filter_params)
+
+        def others(*names):
+            return " AND ".join(conditions[n] for n in names)
+
+        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+        query = text(f"""
+            SELECT GROUPING(gender), GROUPING(year_level), GROUPING(program_code),
+                   gender, year_level, program_code,
+                   COUNT(*) FILTER (WHERE {others("year", "program")}),
+                   COUNT(*) FILTER (WHERE {others("gender", "program")}),
+                   COUNT(*) FILTER (WHERE {others("gender", "year")}),
+                   COUNT(*) FILTER (WHERE {others("gender", "year", "program")})
+            FROM {STUDENTS_FROM}
+            WHERE {where_sql}
+            GROUP BY GROUPING SETS ((gender), (year_level), (program_code), ())
+        """)
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        facets = empty
+        for g_gender, g_year, g_program, gender, year_level, program_code, by_gender, by_year, by_program, total in rows:
+            if not g_gender:
+                if by_gender:
+                    facets["genders"][gender] = by_gender
+            elif not g_year:
+                if by_year:
+                    facets["yearLevels"][str(year_level)] = by_year
+            elif not g_program:
+                if by_program:
+                    facets["programs"][program_code] = by_program
+            else:
+                facets["total"] = total
+        return facets
+
+    def iter_all(self, sort='asc', sort_by='student_id', search=None, search_field='all', genders=None, year_levels=None, programs=None):
+        """
+        Same result as get_rows, but returns a generator of row-dict batches read
+        through a server-side cursor. Arguments are validated before returning,
+        and the connection stays checked out until the generator is exhausted.
+        """
+        built = self._list_query(sort, sort_by, search, search_field, genders, year_levels, programs)
+
+        def batches():
+            if built is None:
+                return
+            query, params = built
+            with self.engine.connect() as conn:
+                conn = conn.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE)
+                result = conn.execute(query, params)
+                for partition in result.partitions():
+                    yield [self._to_dict(row) for row in partition]
+
+        return batches()
+
+    def get_page(self, sort='asc', sort_by='student_id', search=None, search_field='all', genders=None, year_levels=None, programs=None, limit=50, after=None, as_rows=False):
+        """
+        Fetch one page of students using keyset pagination on (sort_by, student_id).
+        With as_rows=True the items are RESPONSE_COLUMNS tuples instead of dicts.
+        """
+        if sort_by == 'relevance':
+            raise ValueError("Cursor pagination is not available for relevance ordering")
+        sort, sort_by = normalize_sort(sort, sort_by, SORTABLE_COLUMNS)
+        filters = self._build_filters(search, search_field, genders, year_levels, programs)
+        if filters is None:
+            return {"items": [], "nextCursor": None}
+        where_clauses, params = filters
+
+        if after:
+            where_clauses.append(keyset_condition(sort_by, "student_id", sort, after, params))
+        params["limit"] = limit + 1
+
+        with self.engine.connect() as conn:
             where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
             query = text(f"""
-                SELECT student_id, first_name, last_name, gender, program_code, year_level, profile_image_url
-                FROM students
+                SELECT student_id, first_name, last_name, gender, program_code, year_level, profile_image_url, profile_thumb_key
+                FROM {STUDENTS_FROM}
                 WHERE {where_sql}
-                ORDER BY {sort_by} {sort.upper()}
+                ORDER BY {keyset_order(sort_by, "student_id", sort)}
+                LIMIT :limit
             """)
-            
-            result = conn.execute(query, params)
-            
-            # Fetch all rows while connection is still open
-            return [{
-                "id": row[0],
-                "firstName": row[1],
-                "lastName": row[2],
-                "gender": row[3],
-                "course": row[4],
-                "yearLevel": row[5],
-                "profileImage": row[6]
-            } for row in result]
+            items = [self._to_row(row) for row in conn.execute(query, params)]
+
+        # Cursor values are read by position from the row tuples
+        page = build_page(items, limit, sort_by, sort, RESPONSE_COLUMNS.index(SORTABLE_COLUMNS[sort_by]), 0)
+        if not as_rows:
+            page["items"] = [dict(zip(RESPONSE_COLUMNS, row)) for row in page["items"]]
+        return page
+
+    def _queue_image_deletes(self, conn, rows):
+        """Queue storage cleanup for deleted (student_id, profile_image_url, profile_thumb_key) rows; returns the count"""
+        queued = 0
+        for student_id, image_url, thumb_key in rows:
+            if image_url or thumb_key:
+                enqueue(conn, "delete_avatar", {"student_id": student_id, "image_url": image_url, "thumb_key": thumb_key})
+                queued += 1
+        return queued
 
     def get_by_id(self, student_id):
-        """Get a single student by ID"""
+        """Get a single student's ID and image URL"""
         with self.engine.connect() as conn:
             result = conn.execute(
-                text("SELECT 1 FROM students WHERE student_id = :id"),
+                text("SELECT student_id, profile_image_url FROM students WHERE student_id = :id"),
                 {"id": student_id}
             ).fetchone()
             return result
@@ -106,64 +327,383 @@ class StudentModel:
         """Check if student exists"""
         return self.get_by_id(student_id) is not None
 
-    def program_exists(self, program_code):
-        """Check if program exists"""
+    def create(self, student_id, first_name, last_name, gender, program_code, year_level, profile_image_url=None, jobs=None):
+        """
+        Create a new student in one statement. jobs are (kind, payload) pairs queued
+        in the same transaction. Raises ConflictError / ConstraintError.
+        """
         with self.engine.connect() as conn:
-            result = conn.execute(
-                text("SELECT 1 FROM programs WHERE program_code = :code"),
-                {"code": program_code}
-            ).fetchone()
-            return result is not None
+            try:
+                created = conn.execute(
+                    text(f"""
+                        INSERT INTO students (student_id, first_name, last_name, gender, program_id, year_level, profile_image_url)
+                        VALUES (:id, :first, :last, :gender, {PROGRAM_ID_SQL.format(param="program")}, :year, :image)
+                        ON CONFLICT (student_id) DO NOTHING
+                        RETURNING student_id
+                    """),
+                    {
+                        "id": student_id,
+                        "first": first_name,
+                        "last": last_name,
+                        "gender": gender,
+                        "program": program_code,
+                        "year": year_level,
+                        "image": profile_image_url
+                    }
+                ).fetchone()
+            except IntegrityError as e:
+                raise_for_integrity(e, WRITE_ERROR_MESSAGES)
+            if created is None:
+                raise ConflictError("Student ID already exists")
+
+            for kind, payload in jobs or ():
+                enqueue(conn, kind, payload)
+            conn.commit()
+        if jobs:
+            notify_workers()
 
-    def create(self, student_id, first_name, last_name, gender, program_code, year_level, profile_image_url=None):
-        """Create a new student"""
+    def update(self, old_id, student_id, first_name, last_name, gender, program_code, year_level, profile_image_url, jobs=None, refresh_thumbnails=True):
+        """
+        Update a student in one statement. jobs are (kind, payload) pairs queued in the
+        same transaction; with refresh_thumbnails, a changed image URL clears the old
+        thumbnails (queueing their removal) and queues new ones.
+        Raises NotFoundError / ConflictError / ConstraintError.
+        """
+        jobs = list(jobs or ())
+        with self.engine.connect() as conn:
+            try:
+                # The locked subquery exposes the pre-update image and thumbnails to RETURNING
+                updated = conn.execute(
+                    text(f"""
+                        UPDATE students s
+                        SET student_id = :new_id, first_name = :first, last_name = :last,
+                            gender = :gender, program_id = {PROGRAM_ID_SQL.format(param="program")}, year_level = :year,
+                            profile_image_url = :image,
+                            profile_thumb_key = CASE
+                                WHEN :refresh AND s.profile_image_url IS DISTINCT FROM :image THEN NULL
+                                ELSE s.profile_thumb_key
+                            END
+                        FROM (
+                            SELECT student_id, profile_image_url, profile_thumb_key FROM students
+                            WHERE student_id = :old_id FOR UPDATE
+                        ) old
+                        WHERE s.student_id = old.student_id
+                        RETURNING old.profile_image_url IS DISTINCT FROM s.profile_image_url, old.profile_thumb_key
+                    """),
+                    {
+                        "old_id": old_id,
+                        "new_id": student_id,
+                        "first": first_name,
+                        "last": last_name,
+                        "gender": gender,
+                        "program": program_code,
+                        "year": year_level,
+                        "image": profile_image_url,
+                        "refresh": refresh_thumbnails
+                    }
+                ).fetchone()
+            except IntegrityError as e:
+                raise_for_integrity(e, {**WRITE_ERROR_MESSAGES, "students_pkey": "New student ID already exists"})
+            if updated is None:
+                raise NotFoundError("Student not found")
+
+            image_changed, old_thumb_key = updated
+            queued = 0
+            if refresh_thumbnails and image_changed:
+                # The old thumbnails show the previous image; a new one needs its own
+                queued = self._queue_image_deletes(conn, [(student_id, None, old_thumb_key)])
+                if profile_image_url:
+                    jobs.append(("generate_thumbnails", {"student_id": student_id, "image_url": profile_image_url}))
+            for kind, payload in jobs:
+                enqueue(conn, kind, payload)
+            conn.commit()
+        if jobs or queued:
+            notify_workers()
+
+    def delete(self, student_id):
+        """Delete a student and queue removal of their stored image. Raises NotFoundError."""
         with self.engine.connect() as conn:
-            conn.execute(
+            deleted = conn.execute(
+                text("DELETE FROM students WHERE student_id = :id RETURNING student_id, profile_image_url, profile_thumb_key"),
+                {"id": student_id}
+            ).fetchall()
+            if not deleted:
+                raise NotFoundError("Student not found")
+            queued = self._queue_image_deletes(conn, deleted)
+            conn.commit()
+        if queued:
+            notify_workers()
+
+    def set_image(self, student_id, image_url, thumb_key):
+        """
+        Point a student at a newly uploaded image and its thumbnails, queueing
+        removal of the previous objects. Returns False if the student is gone.
+        """
+        with self.engine.connect() as conn:
+            previous = conn.execute(
                 text("""
-                    INSERT INTO students (student_id, first_name, last_name, gender, program_code, year_level, profile_image_url)
-                    VALUES (:id, :first, :last, :gender, :program, :year, :image)
+                    UPDATE students s SET profile_image_url = :url, profile_thumb_key = :key
+                    FROM (SELECT student_id, profile_image_url, profile_thumb_key FROM students WHERE student_id = :id FOR UPDATE) old
+                    WHERE s.student_id = old.student_id
+                    RETURNING old.profile_image_url, old.profile_thumb_key
                 """),
-                {
-                    "id": student_id,
-                    "first": first_name,
-                    "last": last_name,
-                    "gender": gender,
-                    "program": program_code,
-                    "year": year_level,
-                    "image": profile_image_url
-                }
-            )
+                {"id": student_id, "url": image_url, "key": thumb_key}
+            ).fetchone()
+            if previous is None:
+                return False
+
+            old_url, old_key = previous
+            if old_url and object_path(old_url) == object_path(image_url):
+                old_url = None  # same object was overwritten in place
+            self._queue_image_deletes(conn, [(student_id, old_url, old_key)])
             conn.commit()
+        notify_workers()
+        return True
 
-    def update(self, old_id, student_id, first_name, last_name, gender, program_code, year_level, profile_image_url):
-        """Update a student"""
+    def set_thumbnails(self, student_id, image_url, thumb_key):
+        """
+        Attach generated thumbnails if the student still has the image they were
+        rendered from. Returns False if the image changed in the meantime.
+        """
         with self.engine.connect() as conn:
-            conn.execute(
+            previous = conn.execute(
                 text("""
-                    UPDATE students 
-                    SET student_id = :new_id, first_name = :first, last_name = :last, 
-                        gender = :gender, program_code = :program, year_level = :year, 
-                        profile_image_url = :image
-                    WHERE student_id = :old_id
+                    UPDATE students s SET profile_thumb_key = :key
+                    FROM (
+                        SELECT student_id, profile_thumb_key FROM students
+                        WHERE student_id = :id AND profile_image_url = :url
+                        FOR UPDATE
+                    ) old
+                    WHERE s.student_id = old.student_id
+                    RETURNING old.profile_thumb_key
                 """),
-                {
-                    "old_id": old_id,
-                    "new_id": student_id,
-                    "first": first_name,
-                    "last": last_name,
-                    "gender": gender,
-                    "program": program_code,
-                    "year": year_level,
-                    "image": profile_image_url
-                }
-            )
+                {"id": student_id, "url": image_url, "key": thumb_key}
+            ).fetchone()
+            if previous is None:
+                return False
+
+            queued = self._queue_image_deletes(conn, [(student_id, None, previous[0])])
             conn.commit()
+        if queued:
+            notify_workers()
+        return True
 
-    def delete(self, student_id):
-        """Delete a student"""
+    def bulk_import(self, rows, on_conflict='skip'):
+        """
+        Load validated rows with COPY into a staging table, reject rows that
+        reference unknown programs or duplicate IDs in set-based passes, then
+        merge the rest into students in the same transaction. Rows whose image
+        changed get their thumbnails regenerated and the old ones deleted, like
+        single creates and updates.
+        rows are (row_no, student_id, first_name, last_name, gender, program_code, year_level, profile_image_url).
+        Returns (imported_count, errors).
+        """
+        if on_conflict not in ('skip', 'update'):
+            raise ValueError("on_conflict must be 'skip' or 'update'")
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+
+        errors = []
         with self.engine.connect() as conn:
-            conn.execute(
-                text("DELETE FROM students WHERE student_id = :id"),
-                {"id": student_id}
-            )
+            conn.execute(text("""
+                CREATE TEMP TABLE student_import (
+                    row_no INTEGER NOT NULL,
+                    student_id VARCHAR(20) NOT NULL,
+                    first_name VARCHAR(100) NOT NULL,
+                    last_name VARCHAR(100) NOT NULL,
+                    gender VARCHAR(10) NOT NULL,
+                    program_code VARCHAR(10) NOT NULL,
+                    year_level INTEGER NOT NULL,
+                    profile_image_url TEXT
+                ) ON COMMIT DROP
+            """))
+
+            cursor = conn.connection.cursor()
+            try:
+                cursor.copy_expert("COPY student_import FROM STDIN WITH (FORMAT csv)", buffer)
+            finally:
+                cursor.close()
+            conn.execute(text("ANALYZE student_import"))
+
+            # Later rows repeating an ID already seen in the file
+            result = conn.execute(text("""
+                DELETE FROM student_import i
+                USING student_import first_row
+                WHERE first_row.student_id = i.student_id AND first_row.row_no < i.row_no
+                RETURNING i.row_no, i.student_id
+            """))
+            errors += [{"row": r[0], "error": f"Duplicate student ID {r[1]} in upload"} for r in result]
+
+            result = conn.execute(text("""
+                DELETE FROM student_import i
+                WHERE NOT EXISTS (SELECT 1 FROM programs p WHERE p.program_code = i.program_code)
+                RETURNING i.row_no, i.program_code
+            """))
+            errors += [{"row": r[0], "error": f"Program code {r[1]} does not exist"} for r in result]
+
+            if on_conflict == 'skip':
+                result = conn.execute(text("""
+                    DELETE FROM student_import i
+                    USING students s
+                    WHERE s.student_id = i.student_id
+                    RETURNING i.row_no, i.student_id
+                """))
+                errors += [{"row": r[0], "error": f"Student ID {r[1]} already exists"} for r in result]
+                conflict_sql = "DO NOTHING"
+            else:
+                conflict_sql = """DO UPDATE SET
+                    first_name = EXCLUDED.first_name,
+                    last_name = EXCLUDED.last_name,
+                    gender = EXCLUDED.gender,
+                    program_id = EXCLUDED.program_id,
+                    year_level = EXCLUDED.year_level,
+                    profile_image_url = COALESCE(EXCLUDED.profile_image_url, students.profile_image_url),
+                    profile_thumb_key = CASE
+                        WHEN EXCLUDED.profile_image_url IS DISTINCT FROM students.profile_image_url
+                             AND EXCLUDED.profile_image_url IS NOT NULL THEN NULL
+                        ELSE students.profile_thumb_key
+                    END"""
+
+                # Lock the rows being merged so the images read below stay current
+                conn.execute(text("""
+                    SELECT 1 FROM students s
+                    JOIN student_import i ON i.student_id = s.student_id
+                    FOR UPDATE OF s
+                """))
+
+            # old holds the pre-merge image and thumbnails of existing rows (all CTEs
+            # share one snapshot); each upserted row comes back next to them
+            result = conn.execute(text(f"""
+                WITH old AS (
+                    SELECT s.student_id, s.profile_image_url, s.profile_thumb_key
+                    FROM students s
+                    JOIN student_import i ON i.student_id = s.student_id
+                ), upserted AS (
+                    INSERT INTO students (student_id, first_name, last_name, gender, program_id, year_level, profile_image_url)
+                    SELECT i.student_id, i.first_name, i.last_name, i.gender, p.id, i.year_level, i.profile_image_url
+                    FROM student_import i
+                    JOIN programs p ON p.program_code = i.program_code
+                    ORDER BY i.row_no
+                    ON CONFLICT (student_id) {conflict_sql}
+                    RETURNING student_id, profile_image_url
+                )
+                SELECT u.student_id, u.profile_image_url, old.student_id IS NOT NULL, old.profile_image_url, old.profile_thumb_key
+                FROM upserted u
+                LEFT JOIN old ON old.student_id = u.student_id
+            """)).fetchall()
+            imported = len(result)
+
+            # New images get thumbnails; the merge cleared the replaced ones, so delete them
+            thumbnails, stale = [], []
+            for student_id, image_url, existed, old_image_url, old_thumb_key in result:
+                if not image_url or (existed and image_url == old_image_url):
+                    continue
+                thumbnails.append({"student_id": student_id, "image_url": image_url})
+                if old_thumb_key:
+                    stale.append({"student_id": student_id, "image_url": None, "thumb_key": old_thumb_key})
+            queued = enqueue_many(conn, "generate_thumbnails", thumbnails) + enqueue_many(conn, "delete_avatar", stale)
+            conn.commit()
+        if queued:
+            notify_workers()
+
+        return imported, errors
+
+    def batch_apply(self, updates, deletes):
+        """
+        Apply per-student updates and deletes in one transaction, one
+        statement per kind. updates are dicts with student_id plus any of
+        BATCH_UPDATE_FIELDS (missing fields keep their current value).
+        Returns (updated_ids, deleted_rows) where deleted_rows are (student_id, profile_image_url, profile_thumb_key).
+        Raises ConstraintError (nothing applied) for unknown program codes or invalid values.
+        """
+        updated_ids = []
+        deleted_rows = []
+        with self.engine.connect() as conn:
+            if updates:
+                params = {"ids": [u["student_id"] for u in updates]}
+                for field in BATCH_UPDATE_FIELDS:
+                    params[field] = [u.get(field) for u in updates]
+                try:
+                    # An unknown program code leaves p.id NULL, which NOT NULL rejects
+                    result = conn.execute(text("""
+                        UPDATE students s SET
+                            first_name = COALESCE(v.first_name, s.first_name),
+                            last_name = COALESCE(v.last_name, s.last_name),
+                            gender = COALESCE(v.gender, s.gender),
+                            program_id = CASE WHEN v.program_code IS NULL THEN s.program_id ELSE p.id END,
+                            year_level = COALESCE(v.year_level, s.year_level)
+                        FROM unnest(
+                            CAST(:ids AS TEXT[]), CAST(:first_name AS TEXT[]), CAST(:last_name AS TEXT[]),
+                            CAST(:gender AS TEXT[]), CAST(:program_code AS TEXT[]), CAST(:year_level AS INTEGER[])
+                        ) AS v(student_id, first_name, last_name, gender, program_code, year_level)
+                        LEFT JOIN programs p ON p.program_code = v.program_code
+                        WHERE s.student_id = v.student_id
+                        RETURNING s.student_id
+                    """), params)
+                except IntegrityError as e:
+                    raise_for_integrity(e, WRITE_ERROR_MESSAGES)
+                updated_ids = [row[0] for row in result]
+
+            if deletes:
+                result = conn.execute(
+                    text("DELETE FROM students WHERE student_id = ANY(:ids) RETURNING student_id, profile_image_url, profile_thumb_key"),
+                    {"ids": list(deletes)}
+                )
+                deleted_rows = [tuple(row) for row in result]
+                self._queue_image_deletes(conn, deleted_rows)
+
+            conn.commit()
+        notify_workers()
+        return updated_ids, deleted_rows
+
+    def mutate_where(self, action, where, changes=None):
+        """
+        Set-based update or delete of every student matching `where`
+        (student_ids, program_codes, year_levels, genders; combined with AND).
+        For updates, changes may hold program_code, year_level or year_level_increment.
+        Returns the affected rows as (student_id, profile_image_url, profile_thumb_key).
+        """
+        where_clauses = []
+        params = {}
+        for key, column in BATCH_FILTER_COLUMNS.items():
+            values = where.get(key)
+            if values:
+                if column == "program_id":
+                    where_clauses.append(f"program_id IN (SELECT id FROM programs WHERE program_code = ANY(:{key}))")
+                else:
+                    where_clauses.append(f"{column} = ANY(:{key})")
+                params[key] = [int(v) for v in values] if column == "year_level" else list(values)
+        if not where_clauses:
+            raise ValueError("A batch filter needs at least one non-empty condition")
+        where_sql = " AND ".join(where_clauses)
+
+        with self.engine.connect() as conn:
+            if action == 'delete':
+                query = f"DELETE FROM students WHERE {where_sql} RETURNING student_id, profile_image_url, profile_thumb_key"
+            else:
+                set_clauses = []
+                changes = changes or {}
+                if changes.get("program_code"):
+                    set_clauses.append(f"program_id = {PROGRAM_ID_SQL.format(param='new_program_code')}")
+                    params["new_program_code"] = changes["program_code"]
+                if changes.get("year_level") is not None:
+                    set_clauses.append("year_level = :new_year_level")
+                    params["new_year_level"] = int(changes["year_level"])
+                elif changes.get("year_level_increment") is not None:
+                    set_clauses.append("year_level = year_level + :year_increment")
+                    params["year_increment"] = int(changes["year_level_increment"])
+                if not set_clauses:
+                    raise ValueError("Nothing to update")
+                query = f"UPDATE students SET {', '.join(set_clauses)} WHERE {where_sql} RETURNING student_id, profile_image_url, profile_thumb_key"
+
+            try:
+                rows = [tuple(row) for row in conn.execute(text(query), params)]
+            except IntegrityError as e:
+                raise_for_integrity(e, WRITE_ERROR_MESSAGES)
+            if action == 'delete':
+                self._queue_image_deletes(conn, rows)
             conn.commit()
+        notify_workers()
+        return rows
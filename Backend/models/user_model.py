@@ -16,23 +16,20 @@ class UserModel:
             ).fetchone()
             return result
 
-    def email_exists(self, email):
-        """Check if email already exists"""
-        with self.engine.connect() as conn:
-            result = conn.execute(
-                text("SELECT 1 FROM users WHERE email = :email"),
-                {"email": email}
-            ).fetchone()
-            return result is not None
-
     def create(self, email, password_hash, first_name, last_name):
-        """Create a new user"""
+        """Create a new user. Returns False if the email is already registered."""
         with self.engine.connect() as conn:
-            conn.execute(
-                text("INSERT INTO users (email, password_hash, first_name, last_name) VALUES (:email, :password_hash, :first_name, :last_name)"),
+            created = conn.execute(
+                text("""
+                    INSERT INTO users (email, password_hash, first_name, last_name)
+                    VALUES (:email, :password_hash, :first_name, :last_name)
+                    ON CONFLICT (email) DO NOTHING
+                    RETURNING id
+                """),
                 {"email": email, "password_hash": password_hash, "first_name": first_name, "last_name": last_name}
-            )
+            ).fetchone()
             conn.commit()
+            return created is not None
 
     def get_profile(self, email):
         """Get user profile information"""
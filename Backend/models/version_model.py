@@ -0,0 +1,21 @@
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+
+class VersionModel:
+    """Model for per-table change counters (maintained by database triggers)"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def get_versions(self, tables):
+        """Return {table: version}, or None if the counters are not installed"""
+        try:
+            with self.engine.connect() as conn:
+                result = conn.execute(
+                    text("SELECT table_name, version FROM table_versions WHERE table_name = ANY(:tables)"),
+                    {"tables": list(tables)}
+                )
+                return {row[0]: row[1] for row in result}
+        except ProgrammingError:
+            return None
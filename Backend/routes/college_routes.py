@@ -15,6 +15,10 @@ def init_college_routes(engine):
     def create_college():
         return controller.create_college()
 
+    @college_bp.route("/api/colleges/batch", methods=["POST"])
+    def batch_colleges():
+        return controller.batch_colleges()
+
     @college_bp.route("/api/colleges", methods=["PUT"])
     def update_college():
         return controller.update_college()
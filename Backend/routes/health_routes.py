@@ -0,0 +1,22 @@
+from flask import Blueprint
+from controllers.health_controller import HealthController
+
+
+def init_health_routes(engine):
+    """Initialize health check routes with MVC pattern"""
+    health_bp = Blueprint("health", __name__, url_prefix="/api/health")
+    controller = HealthController(engine)
+
+    @health_bp.route("/db", methods=["GET"])
+    def database_health():
+        return controller.database_health()
+
+    @health_bp.route("/cache", methods=["GET"])
+    def cache_health():
+        return controller.cache_health()
+
+    @health_bp.route("/jobs", methods=["GET"])
+    def jobs_health():
+        return controller.jobs_health()
+
+    return health_bp
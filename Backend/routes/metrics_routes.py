@@ -0,0 +1,13 @@
+from flask import Blueprint
+from utils.metrics import render_metrics
+
+
+def init_metrics_routes(engine):
+    """Initialize the Prometheus scrape endpoint"""
+    metrics_bp = Blueprint("metrics", __name__)
+
+    @metrics_bp.route("/metrics", methods=["GET"])
+    def metrics():
+        return render_metrics()
+
+    return metrics_bp
@@ -15,6 +15,10 @@ def init_program_routes(engine):
     def create_program():
         return controller.create_program()
 
+    @program_bp.route("/api/programs/batch", methods=["POST"])
+    def batch_programs():
+        return controller.batch_programs()
+
     @program_bp.route("/api/programs", methods=["PUT"])
     def update_program():
         return controller.update_program()
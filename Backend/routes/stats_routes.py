@@ -0,0 +1,14 @@
+from flask import Blueprint
+from controllers.stats_controller import StatsController
+
+
+def init_stats_routes(engine):
+    """Initialize statistics routes with MVC pattern"""
+    stats_bp = Blueprint("stats", __name__)
+    controller = StatsController(engine)
+
+    @stats_bp.route("/api/stats", methods=["GET"])
+    def get_stats():
+        return controller.get_stats()
+
+    return stats_bp
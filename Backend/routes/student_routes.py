@@ -15,6 +15,18 @@ def init_student_routes(engine):
     def create_student():
         return controller.create_student()
 
+    @student_bp.route("/api/students/import", methods=["POST"])
+    def import_students():
+        return controller.import_students()
+
+    @student_bp.route("/api/students/batch", methods=["POST"])
+    def batch_students():
+        return controller.batch_students()
+
+    @student_bp.route("/api/students/image", methods=["POST"])
+    def upload_student_image():
+        return controller.upload_image()
+
     @student_bp.route("/api/students", methods=["PUT"])
     def update_student():
         return controller.update_student()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Precompress the React build for CCC181SSISWEBapplication
+
+Writes .gz (and .br, when the brotli package is installed) sidecars next to
+every compressible file in Backend/static so serve_react can send them as is
+instead of compressing per request. Runs automatically after `npm run build`
+(the postbuild script in Frontend/package.json); safe to re-run. Each sidecar
+carries its source's mtime, so it is rebuilt whenever the source changes
+(including a source restored with an older timestamp) and skipped otherwise.
+
+Usage (from Backend/):
+  python scripts/precompress_static.py
+  python scripts/precompress_static.py --root static --min-bytes 512
+"""
+import argparse
+import gzip
+import os
+import sys
+
+try:
+    import brotli
+except ImportError:  # .gz sidecars only
+    brotli = None
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+
+COMPRESSIBLE_EXTENSIONS = ('.js', '.css', '.html', '.json', '.svg', '.txt', '.map', '.ico')
+SIDECAR_SUFFIXES = ('.gz', '.br')
+
+# A sidecar that saves less than this fraction of the original is not worth serving
+MIN_SAVINGS = 0.1
+
+
+def compressors():
+    """(suffix, function) for every coding available here, at maximum compression"""
+    available = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        available.append(('.br', lambda data: brotli.compress(data, quality=11)))
+    return available
+
+
+def iter_sources(root, min_bytes):
+    for directory, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if filename.endswith(SIDECAR_SUFFIXES) or not filename.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(directory, filename)
+            if os.path.getsize(path) >= min_bytes:
+                yield path
+
+
+def precompress(root, min_bytes=1024):
+    """Write missing or stale sidecars under root. Returns (written, skipped) counts."""
+    written = skipped = 0
+    for path in iter_sources(root, min_bytes):
+        source_stat = os.stat(path)
+        data = None
+        for suffix, compress in compressors():
+            sidecar = path + suffix
+            if os.path.exists(sidecar) and os.stat(sidecar).st_mtime_ns == source_stat.st_mtime_ns:
+                skipped += 1
+                continue
+            if data is None:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            compressed = compress(data)
+            if len(compressed) > len(data) * (1 - MIN_SAVINGS):
+                if os.path.exists(sidecar):
+                    os.remove(sidecar)
+                continue
+            with open(sidecar, 'wb') as f:
+                f.write(compressed)
+            # Stamp the sidecar with its source's mtime; any other value means stale
+            os.utime(sidecar, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+            written += 1
+            print(f'{os.path.relpath(sidecar, root)}: {len(data)} -> {len(compressed)} bytes')
+    return written, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write .gz/.br sidecars for the React build")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="build directory (default: Backend/static)")
+    parser.add_argument("--min-bytes", type=int, default=1024, help="skip files smaller than this")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.root):
+        print(f'Build directory not found: {args.root}')
+        sys.exit(1)
+    if brotli is None:
+        print('brotli is not installed; writing .gz sidecars only')
+
+    written, skipped = precompress(args.root, args.min_bytes)
+    print(f'[OK] Wrote {written} sidecar(s), {skipped} already up to date')
+
+
+if __name__ == '__main__':
+    main()
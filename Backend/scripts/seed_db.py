@@ -1,25 +1,34 @@
 #!/usr/bin/env python3
 """
 Seed script for CCC181SSISWEBapplication
-Generates:
+Generates (at --scale 1, the default):
 - 30 colleges
 - 30 programs
 - 300 students
 
+Rows are generated lazily and streamed into COPY FROM STDIN, so memory use
+stays flat at any size. Students are split into fixed-size chunks, each
+generated from its own seeded RNG and loaded by a pool of worker processes;
+the same --seed always produces the same dataset, whatever --workers is.
+
 Reads DB connection from environment / .env:
 - user, password, host, port, dbname
 
 Usage:
   python Backend/scripts/seed_db.py
+  python Backend/scripts/seed_db.py --scale 10000 --workers 8 --truncate   # 3M students
+  python Backend/scripts/seed_db.py --students 40 --program-codes BSA --id-prefix 2024- --start-id 5000
 
 This will use psycopg2 and python-dotenv (already in requirements).
 """
+import argparse
 import os
 import random
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 import psycopg2
-from psycopg2.extras import execute_values
 
 # Load environment variables from project root .env if present
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -31,104 +40,287 @@ HOST = os.getenv('host') or os.getenv('HOST') or 'localhost'
 PORT = os.getenv('port') or os.getenv('PORT') or '5432'
 DBNAME = os.getenv('dbname') or os.getenv('DBNAME')
 
-if not all([USER, PASSWORD, HOST, PORT, DBNAME]):
-    print('Database credentials are not fully set in environment. Please set user, password, host, port, dbname or place them in .env')
-    sys.exit(1)
 
-CONN_STR = f"dbname={DBNAME} user={USER} password={PASSWORD} host={HOST} port={PORT}"
+def get_conn_str():
+    """Connection string from the environment, or None if credentials are incomplete"""
+    if not all([USER, PASSWORD, HOST, PORT, DBNAME]):
+        return None
+    return f"dbname={DBNAME} user={USER} password={PASSWORD} host={HOST} port={PORT}"
+
 
 FIRST_NAMES = [
     'Alex','Jamie','Sam','Taylor','Jordan','Casey','Riley','Morgan','Avery','Peyton',
     'Chris','Pat','Drew','Cameron','Quinn','Devin','Skyler','Hayden','Kai','Rowan',
-    'Evelyn','Olivia','Sophia','Isabella','Mia','Charlotte','Amelia','Harper','Eleanor','Penelope'
+    'Evelyn','Olivia','Sophia','Isabella','Mia','Charlotte','Amelia','Harper','Eleanor','Penelope',
+    'Emma','Ava','Luna','Ella','Lily','Grace','Chloe','Zoe','Madison','Victoria',
+    'John','Michael','David','James','Robert','William','Joseph','Thomas','Charles','Daniel'
 ]
 
 LAST_NAMES = [
     'Garcia','Smith','Johnson','Brown','Williams','Jones','Miller','Davis','Rodriguez','Martinez',
     'Hernandez','Lopez','Gonzalez','Wilson','Anderson','Thomas','Taylor','Moore','Jackson','Martin',
-    'Lee','Perez','Thompson','White','Harris','Sanchez','Clark','Ramirez','Lewis','Robinson'
+    'Lee','Perez','Thompson','White','Harris','Sanchez','Clark','Ramirez','Lewis','Robinson',
+    'Walker','Young','Allen','King','Wright','Scott','Torres','Nguyen','Hill','Flores'
 ]
 
+COLLEGE_TOPICS = ['Computer Studies','Engineering','Business','Education','Arts','Science','Health','Management','Law','Agriculture']
+PROGRAM_TOPICS = ['Computer Science','Information Technology','Civil Engineering','Business Administration','Biology','Nursing','Psychology','Education','Accounting','Architecture']
+
 COLLEGE_PREFIX = 'C'
 PROGRAM_PREFIX = 'P'
 
-def generate_colleges(n=30):
-    colleges = []
-    for i in range(1, n+1):
-        code = f"{COLLEGE_PREFIX}{i:02d}"
-        name = f"College of {random.choice(['Computer Studies','Engineering','Business','Education','Arts','Science','Health','Management','Law','Agriculture'])} {i}"
-        colleges.append((code, name))
-    return colleges
+BASE_COLLEGES = 30
+BASE_PROGRAMS = 30
+BASE_STUDENTS = 300
+
+# Students per COPY / per RNG; part of what makes a --seed reproducible, so changing it changes the data
+CHUNK_SIZE = 100_000
+COPY_BUFFER_SIZE = 1 << 20
+
+STUDENT_COLUMNS = ("student_id", "first_name", "last_name", "gender", "program_id", "year_level", "profile_image_url")
+STUDENT_STAGING_DDL = """
+    CREATE TEMP TABLE seed_staging (
+        student_id VARCHAR(20), first_name VARCHAR(100), last_name VARCHAR(100), gender VARCHAR(10),
+        program_id INTEGER, year_level INTEGER, profile_image_url TEXT
+    ) ON COMMIT DROP
+"""
 
-def generate_programs(n=30, colleges=None):
+
+def generate_colleges(n=BASE_COLLEGES, seed=None):
+    rng = random.Random(f"{seed}:colleges")
+    return [
+        (f"{COLLEGE_PREFIX}{i:02d}", f"College of {rng.choice(COLLEGE_TOPICS)} {i}")
+        for i in range(1, n+1)
+    ]
+
+
+def generate_programs(n=BASE_PROGRAMS, colleges=None, seed=None):
+    rng = random.Random(f"{seed}:programs")
     programs = []
     for i in range(1, n+1):
         code = f"{PROGRAM_PREFIX}{i:02d}"
-        name = f"Program {i} in {random.choice(['Computer Science','Information Technology','Civil Engineering','Business Administration','Biology','Nursing','Psychology','Education','Accounting','Architecture'])}"
-        college_code = random.choice(colleges)[0] if colleges else f"{COLLEGE_PREFIX}{random.randint(1,30):02d}"
+        name = f"Program {i} in {rng.choice(PROGRAM_TOPICS)}"
+        college_code = rng.choice(colleges)[0] if colleges else f"{COLLEGE_PREFIX}{rng.randint(1,BASE_COLLEGES):02d}"
         programs.append((code, name, college_code))
     return programs
 
-def generate_students(n=300, programs=None):
-    students = []
-    for i in range(1, n+1):
-        student_id = f"2025-{i:04d}"
-        first_name = random.choice(FIRST_NAMES)
-        last_name = random.choice(LAST_NAMES)
-        gender = random.choices(['M','F','Others'], weights=[45,45,10], k=1)[0]
-        program_code = random.choice(programs)[0] if programs else f"{PROGRAM_PREFIX}{random.randint(1,30):02d}"
-        year_level = random.randint(1,5)
-        profile_image_url = None
-        students.append((student_id, first_name, last_name, gender, program_code, year_level, profile_image_url))
-    return students
 
+def iter_students(start, count, program_ids, seed=None, id_prefix='2025-', max_year=5):
+    """Yield student tuples for ids start .. start+count-1 from a chunk-specific RNG"""
+    rng = random.Random(f"{seed}:students:{start}")
+    for i in range(start, start+count):
+        yield (
+            f"{id_prefix}{i:04d}",
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            rng.choices(['M','F','Others'], weights=[45,45,10], k=1)[0],
+            rng.choice(program_ids),
+            rng.randint(1, max_year),
+            None,
+        )
 
-def insert_colleges(conn, colleges):
-    sql = "INSERT INTO colleges (college_code, college_name) VALUES %s ON CONFLICT (college_code) DO NOTHING"
+
+def _copy_line(row):
+    """One row in COPY text format (generated values never contain tabs or backslashes)"""
+    return "\t".join("\\N" if value is None else str(value) for value in row) + "\n"
+
+
+class CopyStream:
+    """File-like reader over a row iterator, consumed by cursor.copy_expert"""
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._pending = b""
+
+    def read(self, size=-1):
+        parts = [self._pending]
+        total = len(self._pending)
+        if size < 0 or total < size:
+            for row in self._rows:
+                data = _copy_line(row).encode()
+                parts.append(data)
+                total += len(data)
+                if 0 <= size <= total:
+                    break
+        data = b"".join(parts)
+        if size < 0:
+            self._pending = b""
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
+
+def copy_rows(conn, table, columns, rows, staging_ddl=None, conflict_column=None, insert_sql=None):
+    """
+    Stream rows into table with COPY. With staging_ddl, rows go through a temp
+    table first so existing keys are skipped (ON CONFLICT DO NOTHING); without
+    it they are copied straight in and a duplicate key aborts the load.
+    insert_sql overrides the staging -> table INSERT (e.g. to resolve codes to ids).
+    Returns the number of rows inserted. Commits.
+    """
+    column_sql = ", ".join(columns)
     with conn.cursor() as cur:
-        execute_values(cur, sql, colleges)
+        if staging_ddl is None:
+            cur.copy_expert(f"COPY {table} ({column_sql}) FROM STDIN", CopyStream(rows), size=COPY_BUFFER_SIZE)
+            inserted = cur.rowcount
+        else:
+            cur.execute(staging_ddl)
+            cur.copy_expert(f"COPY seed_staging ({column_sql}) FROM STDIN", CopyStream(rows), size=COPY_BUFFER_SIZE)
+            cur.execute(insert_sql or (
+                f"INSERT INTO {table} ({column_sql}) SELECT {column_sql} FROM seed_staging "
+                f"ON CONFLICT ({conflict_column}) DO NOTHING"
+            ))
+            inserted = cur.rowcount
     conn.commit()
+    return inserted
+
+
+def insert_colleges(conn, colleges):
+    return copy_rows(
+        conn, "colleges", ("college_code", "college_name"), iter(colleges),
+        "CREATE TEMP TABLE seed_staging (college_code VARCHAR(10), college_name VARCHAR(255)) ON COMMIT DROP",
+        "college_code",
+    )
 
 
 def insert_programs(conn, programs):
-    sql = "INSERT INTO programs (program_code, program_name, college_code) VALUES %s ON CONFLICT (program_code) DO NOTHING"
-    with conn.cursor() as cur:
-        execute_values(cur, sql, programs)
-    conn.commit()
+    """programs are (program_code, program_name, college_code); college codes are resolved to ids"""
+    return copy_rows(
+        conn, "programs", ("program_code", "program_name", "college_code"), iter(programs),
+        "CREATE TEMP TABLE seed_staging (program_code VARCHAR(10), program_name VARCHAR(255), college_code VARCHAR(10)) ON COMMIT DROP",
+        insert_sql="""
+            INSERT INTO programs (program_code, program_name, college_id)
+            SELECT s.program_code, s.program_name, c.id
+            FROM seed_staging s JOIN colleges c ON c.college_code = s.college_code
+            ON CONFLICT (program_code) DO NOTHING
+        """,
+    )
+
+
+def get_program_ids(conn_str, program_codes):
+    """Map program codes to ids, keeping the order of program_codes (so a seed picks the same programs)"""
+    conn = psycopg2.connect(conn_str)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT program_code, id FROM programs WHERE program_code = ANY(%s)", (list(program_codes),))
+            ids = dict(cur.fetchall())
+    finally:
+        conn.close()
+    missing = [code for code in program_codes if code not in ids]
+    if missing:
+        raise ValueError(f"Unknown program codes: {', '.join(missing)}")
+    return [ids[code] for code in program_codes]
+
 
+def _copy_student_chunk(conn_str, start, count, program_ids, seed, id_prefix, max_year, skip_existing):
+    """Worker entry point: load one chunk of students over its own connection"""
+    conn = psycopg2.connect(conn_str)
+    try:
+        rows = iter_students(start, count, program_ids, seed, id_prefix, max_year)
+        staging = STUDENT_STAGING_DDL if skip_existing else None
+        return copy_rows(conn, "students", STUDENT_COLUMNS, rows, staging, "student_id")
+    finally:
+        conn.close()
 
-def insert_students(conn, students):
-    sql = "INSERT INTO students (student_id, first_name, last_name, gender, program_code, year_level, profile_image_url) VALUES %s ON CONFLICT (student_id) DO NOTHING"
+
+def seed_students(conn_str, count, program_codes, seed=None, workers=1, id_prefix='2025-', start_id=1, max_year=5, skip_existing=True):
+    """Generate and COPY `count` students in CHUNK_SIZE chunks over `workers` processes. Returns rows inserted."""
+    program_ids = get_program_ids(conn_str, program_codes)
+    chunks = [
+        (conn_str, start, min(CHUNK_SIZE, start_id + count - start), program_ids, seed, id_prefix, max_year, skip_existing)
+        for start in range(start_id, start_id + count, CHUNK_SIZE)
+    ]
+    if workers <= 1 or len(chunks) <= 1:
+        return sum(_copy_student_chunk(*chunk) for chunk in chunks)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        futures = [pool.submit(_copy_student_chunk, *chunk) for chunk in chunks]
+        return sum(future.result() for future in futures)
+
+
+def truncate_tables(conn):
+    """Empty the seeded tables, keeping the N/A sentinel rows"""
     with conn.cursor() as cur:
-        execute_values(cur, sql, students)
+        cur.execute("TRUNCATE students")
+        cur.execute("DELETE FROM programs WHERE program_code <> 'N/A'")
+        cur.execute("DELETE FROM colleges WHERE college_code <> 'N/A'")
     conn.commit()
 
 
-def main():
-    colleges = generate_colleges(30)
-    programs = generate_programs(30, colleges)
-    students = generate_students(300, programs)
+def seed_all(conn_str, colleges=BASE_COLLEGES, programs=BASE_PROGRAMS, students=BASE_STUDENTS, seed=None, workers=1,
+             truncate=False, id_prefix='2025-', start_id=1, max_year=5):
+    """Seed colleges, programs and students; returns the number of students inserted"""
+    college_rows = generate_colleges(colleges, seed)
+    program_rows = generate_programs(programs, college_rows, seed)
+
+    conn = psycopg2.connect(conn_str)
+    try:
+        if truncate:
+            truncate_tables(conn)
+        print(f'Inserted {insert_colleges(conn, college_rows)} colleges')
+        print(f'Inserted {insert_programs(conn, program_rows)} programs')
+    finally:
+        conn.close()
 
-    print(f"Generated {len(colleges)} colleges, {len(programs)} programs, {len(students)} students")
+    started_at = time.perf_counter()
+    inserted = seed_students(
+        conn_str, students, [p[0] for p in program_rows], seed, workers,
+        id_prefix, start_id, max_year, skip_existing=not truncate
+    )
+    print(f'Inserted {inserted} students in {time.perf_counter() - started_at:.1f}s')
 
+    conn = psycopg2.connect(conn_str)
     try:
-        conn = psycopg2.connect(CONN_STR)
-        print('Connected to DB')
-    except Exception as e:
-        print('Failed to connect to DB:', e)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE colleges, programs, students")
+    finally:
+        conn.close()
+    return inserted
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed colleges, programs and students with synthetic data")
+    parser.add_argument("--scale", type=float, default=1, help=f"multiplies the default {BASE_STUDENTS} students")
+    parser.add_argument("--students", type=int, help="exact number of students (overrides --scale)")
+    parser.add_argument("--colleges", type=int, default=BASE_COLLEGES)
+    parser.add_argument("--programs", type=int, default=BASE_PROGRAMS)
+    parser.add_argument("--seed", type=int, default=181, help="random seed; the same seed gives the same data")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel COPY worker processes")
+    parser.add_argument("--truncate", action="store_true", help="empty the tables first and COPY straight into them (fastest)")
+    parser.add_argument("--program-codes", help="comma-separated existing programs to put students in (skips colleges/programs)")
+    parser.add_argument("--id-prefix", default="2025-")
+    parser.add_argument("--start-id", type=int, default=1)
+    parser.add_argument("--max-year", type=int, default=5, choices=range(1, 6))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    conn_str = get_conn_str()
+    if conn_str is None:
+        print('Database credentials are not fully set in environment. Please set user, password, host, port, dbname or place them in .env')
         sys.exit(1)
 
+    students = args.students if args.students is not None else int(BASE_STUDENTS * args.scale)
+
     try:
-        insert_colleges(conn, colleges)
-        print('Inserted colleges')
-        insert_programs(conn, programs)
-        print('Inserted programs')
-        insert_students(conn, students)
-        print('Inserted students')
-    except Exception as e:
+        if args.program_codes:
+            program_codes = [code.strip() for code in args.program_codes.split(',') if code.strip()]
+            inserted = seed_students(
+                conn_str, students, program_codes, args.seed, args.workers,
+                args.id_prefix, args.start_id, args.max_year
+            )
+            print(f'Inserted {inserted} students into {", ".join(program_codes)}')
+        else:
+            seed_all(
+                conn_str, args.colleges, args.programs, students, args.seed, args.workers,
+                args.truncate, args.id_prefix, args.start_id, args.max_year
+            )
+    except (psycopg2.Error, ValueError) as e:
         print('Error inserting data:', e)
-    finally:
-        conn.close()
+        sys.exit(1)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,67 @@
+from models.student_model import StudentModel
+from utils.jobs import job_handler
+from utils.storage import get_storage
+from utils.thumbnails import create_thumbnails, thumbnails_available, variant_paths
+
+
+def plan_image_rename(old_student_id, new_student_id, image_url):
+    """
+    Work out where a student's image moves when their ID changes.
+    Returns (old_path, new_path, new_url), or None when the image is not
+    stored under the old ID (no image, external URL, or already re-uploaded).
+    """
+    try:
+        storage = get_storage()
+    except RuntimeError as e:
+        print(f"Storage not available: {e}")
+        return None
+
+    old_path = storage.path_from_url(image_url)
+    old_file = old_path.rsplit('/', 1)[-1] if old_path else None
+    if not old_file or not old_file.startswith(f"{old_student_id}."):
+        return None
+
+    file_ext = old_file.split('.')[-1]
+    new_path = f"students/{new_student_id}.{file_ext}"
+    return old_path, new_path, storage.public_url(new_path)
+
+
+@job_handler("move_avatar")
+def move_image_job(engine, payload):
+    """Background job: move an avatar object from payload['from'] to payload['to'] inside the store"""
+    get_storage().move(payload["from"], payload["to"])
+    print(f"Successfully renamed image from {payload['from']} to {payload['to']}")
+
+
+@job_handler("delete_avatar")
+def delete_image_job(engine, payload):
+    """Background job: delete the avatar behind payload['image_url'] and the thumbnails under payload['thumb_key']"""
+    storage = get_storage()
+    paths = []
+    path = storage.path_from_url(payload.get("image_url"))
+    if path:
+        paths.append(path)
+    if payload.get("thumb_key"):
+        paths += variant_paths(payload["thumb_key"])
+    if not paths:
+        return
+
+    storage.delete(paths)
+    print(f"Successfully deleted {len(paths)} image object(s) for student {payload.get('student_id')}")
+
+
+@job_handler("generate_thumbnails")
+def generate_thumbnails_job(engine, payload):
+    """Background job: render thumbnails for an image set through create/update instead of the upload endpoint"""
+    if not thumbnails_available():
+        return
+
+    storage = get_storage()
+    path = storage.path_from_url(payload["image_url"])
+    if not path:
+        return  # external URL, nothing we can read
+
+    key = create_thumbnails(storage, storage.download(path))
+    if not StudentModel(engine).set_thumbnails(payload["student_id"], payload["image_url"], key):
+        # The image changed while rendering; drop the orphaned variants
+        storage.delete(variant_paths(key))
@@ -0,0 +1,19 @@
+# Cap on codes accepted by one bulk delete request
+MAX_BATCH_CODES = 1000
+
+
+def parse_code_list(values, field, max_codes=MAX_BATCH_CODES):
+    """Validate a JSON list of codes into unique, stripped strings (first occurrence wins)"""
+    if not isinstance(values, list) or not values:
+        raise ValueError(f"{field} must be a non-empty list")
+    if len(values) > max_codes:
+        raise ValueError(f"{field} may contain at most {max_codes} codes")
+
+    codes = []
+    for index, value in enumerate(values):
+        code = str(value).strip() if isinstance(value, (str, int)) else ''
+        if not code:
+            raise ValueError(f"{field}[{index}] must be a non-empty code")
+        if code not in codes:
+            codes.append(code)
+    return codes
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from utils.metrics import observe_cache_lookup
+
+
+CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", "256"))
+CACHE_TTL = float(os.getenv("CACHE_TTL", "60"))
+
+
+class ListCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL for list query results.
+    Each worker process has its own copy; writes in this process invalidate
+    it immediately, while the TTL bounds staleness from writes in other workers.
+    Callers that know the table versions put them in the key, so a write in
+    another worker is seen as soon as the version counters move.
+    """
+
+    def __init__(self, name, maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on invalidate so loads that started earlier are not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (True, value) on a fresh hit, (False, None) otherwise"""
+        hit, value = False, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, cached = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    hit, value = True, cached
+                else:
+                    del self._entries[key]
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        observe_cache_lookup(self.name, hit)
+        return hit, value
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for key, calling loader() on a miss"""
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return loader()
+        generation = self._generation
+        hit, value = self.get(key)
+        if hit:
+            return value
+        value = loader()
+        self.set(key, value, generation)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+_caches = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(name):
+    """Return the process-wide cache registered under name"""
+    with _registry_lock:
+        if name not in _caches:
+            _caches[name] = ListCache(name)
+        return _caches[name]
+
+
+def cache_stats():
+    """Stats for every registered cache, keyed by name"""
+    with _registry_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+def make_key(*parts):
+    """Normalize query arguments into a hashable key (filter lists are order-insensitive)"""
+    normalized = []
+    for part in parts:
+        if isinstance(part, dict):
+            part = tuple(sorted(part.items()))
+        elif isinstance(part, (list, tuple, set)):
+            part = tuple(sorted(str(p) for p in part)) or None
+        elif isinstance(part, str):
+            part = part.strip() or None
+        normalized.append(part)
+    return tuple(normalized)
@@ -0,0 +1,119 @@
+import gzip
+import os
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+# Buffered bodies smaller than this are sent as is (streamed bodies are always compressed)
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+# Per-request brotli favours speed; build-time sidecars use the maximum quality
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+# Precompressed sidecars written by scripts/precompress_static.py (see utils/static_files.py)
+SIDECAR_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/csv",
+    "text/plain",
+    "text/html",
+    "text/css",
+    "image/svg+xml",
+}
+
+
+def supported_encodings():
+    """Content codings this process can produce, in order of preference"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(offered=None):
+    """Best coding the client accepts out of `offered` (default: supported_encodings()), or None"""
+    offered = offered or supported_encodings()
+    return request.accept_encodings.best_match(offered) if offered else None
+
+
+def compress_bytes(data, encoding, level=None):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY if level is None else level)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL if level is None else level, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor; flush() emits everything buffered so far so clients see each chunk"""
+
+    def __init__(self, encoding):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self.compress = self._compressor.process
+            self.flush = self._compressor.flush
+            self.finish = self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+            self.compress = self._compressor.compress
+            self.flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.finish = self._compressor.flush
+
+
+def _compress_stream(chunks, encoding):
+    compressor = _StreamCompressor(encoding)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield compressor.compress(chunk) + compressor.flush()
+        yield compressor.finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def compress_response(response):
+    """Compress a response in place for the negotiated coding when it is worth it"""
+    response.vary.add("Accept-Encoding")
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or request.method == "HEAD"
+            or "Content-Encoding" in response.headers
+            or response.direct_passthrough
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compress_bytes(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_compression(app, blueprints):
+    """Negotiate gzip/brotli for responses of the given blueprints"""
+    if not COMPRESSION_ENABLED:
+        return
+    names = {bp.name for bp in blueprints}
+
+    @app.after_request
+    def compress_api_response(response):
+        if request.blueprint in names:
+            return compress_response(response)
+        return response
+
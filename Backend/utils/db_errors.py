@@ -0,0 +1,42 @@
+from psycopg2 import errorcodes
+
+
+class ModelError(Exception):
+    """A write the database rejected; status_code is the HTTP status to answer with"""
+    status_code = 400
+
+
+class NotFoundError(ModelError):
+    status_code = 404
+
+
+class ConflictError(ModelError):
+    """Duplicate key, or a row that is still referenced"""
+    status_code = 409
+
+
+class ConstraintError(ModelError):
+    """Unknown foreign key or a failed CHECK constraint"""
+    status_code = 400
+
+
+def raise_for_integrity(error, messages=None, deleting=False):
+    """
+    Re-raise a SQLAlchemy IntegrityError as a ModelError. messages maps constraint
+    names (or, for NOT NULL violations, column names) to user-facing text. A foreign
+    key violation while deleting means the row is still referenced (409); otherwise
+    it points at a missing parent (400).
+    """
+    orig = getattr(error, "orig", None)
+    code = getattr(orig, "pgcode", None)
+    diag = getattr(orig, "diag", None)
+    constraint = getattr(diag, "constraint_name", None) or getattr(diag, "column_name", None)
+    message = (messages or {}).get(constraint) or str(orig).splitlines()[0]
+
+    if code == errorcodes.UNIQUE_VIOLATION:
+        raise ConflictError(message) from error
+    if code == errorcodes.FOREIGN_KEY_VIOLATION:
+        raise (ConflictError if deleting else ConstraintError)(message) from error
+    if code in (errorcodes.CHECK_VIOLATION, errorcodes.NOT_NULL_VIOLATION):
+        raise ConstraintError(message) from error
+    raise error
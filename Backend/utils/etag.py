@@ -0,0 +1,36 @@
+import hashlib
+from flask import request, make_response
+
+
+# Bump when the response format changes so old ETags stop matching
+ETAG_FORMAT_VERSION = "1"
+
+
+def collection_etag(versions):
+    """
+    Build an ETag for a collection response from its tables' versions and
+    the request's query arguments (different filters produce different bodies).
+    """
+    if versions is None:
+        return None
+    args = sorted(request.args.items(multi=True))
+    payload = f"{ETAG_FORMAT_VERSION}|{sorted(versions.items())}|{args}"
+    return hashlib.sha1(payload.encode()).hexdigest()[:20]
+
+
+def not_modified(etag):
+    """Return a 304 response if the client already holds this ETag, else None"""
+    if etag and request.if_none_match.contains_weak(etag):
+        response = make_response("", 304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+
+def with_etag(response, etag):
+    """Attach a weak ETag to a 200 response"""
+    response = make_response(response, 200)
+    if etag:
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "no-cache"
+    return response
@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+import traceback
+from sqlalchemy import text
+
+
+JOBS_WORKER_THREADS = int(os.getenv("JOBS_WORKER_THREADS", "1"))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "5"))
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "5"))
+# Jobs left 'running' longer than this (worker died mid-job) are picked up again
+JOBS_STALE_AFTER = int(os.getenv("JOBS_STALE_AFTER", "300"))
+
+_handlers = {}
+_periodic = []
+_periodic_lock = threading.Lock()
+_wakeup = threading.Event()
+
+
+def job_handler(kind):
+    """Register a function(engine, payload) as the handler for a job kind. Raising marks the attempt failed."""
+    def register(func):
+        _handlers[kind] = func
+        return func
+    return register
+
+
+def periodic_task(interval):
+    """Register a function(engine) that worker loops call every `interval` seconds (per process)"""
+    def register(func):
+        _periodic.append({"func": func, "interval": interval, "next_run": 0.0})
+        return func
+    return register
+
+
+def enqueue(conn, kind, payload):
+    """Insert a job inside the caller's transaction (outbox): it only runs if that transaction commits"""
+    conn.execute(
+        text("INSERT INTO jobs (kind, payload) VALUES (:kind, CAST(:payload AS JSONB))"),
+        {"kind": kind, "payload": json.dumps(payload)}
+    )
+
+
+def enqueue_many(conn, kind, payloads):
+    """enqueue() for a list of payloads in one round trip; returns the count"""
+    if not payloads:
+        return 0
+    conn.execute(
+        text("INSERT INTO jobs (kind, payload) SELECT :kind, value FROM jsonb_array_elements(CAST(:payloads AS JSONB))"),
+        {"kind": kind, "payloads": json.dumps(payloads)}
+    )
+    return len(payloads)
+
+
+def notify_workers():
+    """Wake this process's worker threads after committing new jobs"""
+    _wakeup.set()
+
+
+def _claim(engine):
+    with engine.connect() as conn:
+        row = conn.execute(text("""
+            UPDATE jobs SET status = 'running', attempts = attempts + 1, locked_at = CURRENT_TIMESTAMP
+            WHERE id = (
+                SELECT id FROM jobs
+                WHERE (status = 'pending' AND run_after <= CURRENT_TIMESTAMP)
+                   OR (status = 'running' AND locked_at < CURRENT_TIMESTAMP - make_interval(secs => :stale))
+                ORDER BY run_after, id
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING id, kind, payload, attempts
+        """), {"stale": JOBS_STALE_AFTER}).fetchone()
+        conn.commit()
+        return row
+
+
+def _finish(engine, job_id, attempts, error):
+    with engine.connect() as conn:
+        if error is None:
+            conn.execute(text("DELETE FROM jobs WHERE id = :id"), {"id": job_id})
+        elif attempts >= JOBS_MAX_ATTEMPTS:
+            conn.execute(
+                text("UPDATE jobs SET status = 'failed', locked_at = NULL, last_error = :error WHERE id = :id"),
+                {"id": job_id, "error": error}
+            )
+        else:
+            # Exponential backoff: 2, 4, 8, ... seconds
+            conn.execute(
+                text("""
+                    UPDATE jobs SET status = 'pending', locked_at = NULL, last_error = :error,
+                        run_after = CURRENT_TIMESTAMP + make_interval(secs => :delay)
+                    WHERE id = :id
+                """),
+                {"id": job_id, "error": error, "delay": 2 ** attempts}
+            )
+        conn.commit()
+
+
+def run_pending_jobs(engine):
+    """Process runnable jobs until none are left. Returns the number processed."""
+    processed = 0
+    while True:
+        job = _claim(engine)
+        if job is None:
+            return processed
+        job_id, kind, payload, attempts = job
+        error = None
+        try:
+            handler = _handlers.get(kind)
+            if handler is None:
+                raise RuntimeError(f"No handler registered for job kind '{kind}'")
+            handler(engine, payload)
+        except Exception as e:
+            error = f"{e}\n{traceback.format_exc(limit=5)}"
+            print(f"Job {job_id} ({kind}) attempt {attempts} failed: {e}")
+        _finish(engine, job_id, attempts, error)
+        processed += 1
+
+
+def run_periodic_tasks(engine):
+    """Run registered periodic tasks that are due. Safe to call from several threads."""
+    now = time.monotonic()
+    for task in _periodic:
+        with _periodic_lock:
+            if task["next_run"] > now:
+                continue
+            task["next_run"] = now + task["interval"]
+        try:
+            task["func"](engine)
+        except Exception as e:
+            print(f"Periodic task {task['func'].__name__} failed: {e}")
+
+
+def _worker_loop(engine, stop_event):
+    while not stop_event.is_set():
+        try:
+            run_pending_jobs(engine)
+        except Exception as e:
+            print(f"Job worker error: {e}")
+        run_periodic_tasks(engine)
+        _wakeup.wait(JOBS_POLL_INTERVAL)
+        _wakeup.clear()
+
+
+def run_worker_forever(engine):
+    """Run a worker loop in the foreground (dedicated worker process)"""
+    _worker_loop(engine, threading.Event())
+
+
+def start_job_workers(engine, threads=JOBS_WORKER_THREADS):
+    """Start daemon worker threads in this process. Returns an event that stops them."""
+    stop_event = threading.Event()
+    for i in range(threads):
+        threading.Thread(target=_worker_loop, args=(engine, stop_event), name=f"job-worker-{i}", daemon=True).start()
+    if threads:
+        print(f"[OK] Started {threads} background job worker(s)")
+    return stop_event
+
+
+def job_counts(engine):
+    """Number of queued jobs by status"""
+    with engine.connect() as conn:
+        result = conn.execute(text("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+        return {row[0]: row[1] for row in result}
@@ -0,0 +1,149 @@
+import os
+import time
+from flask import Response, g, request
+from sqlalchemy import event
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ImportError:  # metrics are optional
+    prometheus_client = None
+
+
+# With several gunicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty directory
+# (wiped on deploy) before start-up so every worker writes its samples there
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.getenv("prometheus_multiproc_dir")
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def metrics_available():
+    return prometheus_client is not None and METRICS_ENABLED
+
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        "ssis_http_request_duration_seconds", "Request latency by blueprint",
+        ["blueprint", "method"], buckets=LATENCY_BUCKETS
+    )
+    REQUEST_COUNT = Counter(
+        "ssis_http_requests_total", "Responses by blueprint and status code",
+        ["blueprint", "method", "status"]
+    )
+    IN_FLIGHT = Gauge(
+        "ssis_http_requests_in_flight", "Requests currently being handled",
+        ["blueprint"], multiprocess_mode="livesum"
+    )
+    DB_POOL_SIZE = Gauge(
+        "ssis_db_pool_size", "Configured pool size summed over live workers",
+        multiprocess_mode="livesum"
+    )
+    DB_POOL_CHECKED_OUT = Gauge(
+        "ssis_db_pool_checked_out", "Connections currently checked out of the pool",
+        multiprocess_mode="livesum"
+    )
+    DB_POOL_EVENTS = Counter(
+        "ssis_db_pool_events_total", "Pool connection events (connect, checkout, invalidate)",
+        ["event"]
+    )
+    CACHE_LOOKUPS = Counter(
+        "ssis_cache_lookups_total", "List cache lookups by result (hit or miss)",
+        ["cache", "result"]
+    )
+    STORAGE_LATENCY = Histogram(
+        "ssis_storage_call_duration_seconds", "Object storage call latency",
+        ["backend", "operation"], buckets=LATENCY_BUCKETS
+    )
+    STORAGE_ERRORS = Counter(
+        "ssis_storage_call_errors_total", "Object storage calls that raised",
+        ["backend", "operation"]
+    )
+
+
+def _blueprint_label():
+    return request.blueprint or "app"
+
+
+def init_request_metrics(app):
+    """Record latency, status codes and in-flight requests for every request"""
+    if not metrics_available():
+        return
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started_at = time.perf_counter()
+        g.metrics_blueprint = _blueprint_label()
+        IN_FLIGHT.labels(g.metrics_blueprint).inc()
+
+    @app.after_request
+    def record_request_metrics(response):
+        if "metrics_started_at" in g:
+            REQUEST_LATENCY.labels(g.metrics_blueprint, request.method).observe(time.perf_counter() - g.metrics_started_at)
+            REQUEST_COUNT.labels(g.metrics_blueprint, request.method, str(response.status_code)).inc()
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        # Runs even when a view raised, so the gauge never drifts upwards
+        blueprint = g.pop("metrics_blueprint", None)
+        if blueprint is not None:
+            IN_FLIGHT.labels(blueprint).dec()
+
+
+def instrument_pool(engine):
+    """Track pool checkouts through pool events (works across worker processes)"""
+    if not metrics_available():
+        return
+
+    pool = engine.pool
+    if hasattr(pool, "size"):
+        DB_POOL_SIZE.set(pool.size())
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        DB_POOL_EVENTS.labels("connect").inc()
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_EVENTS.labels("checkout").inc()
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_EVENTS.labels("invalidate").inc()
+
+
+def observe_cache_lookup(cache_name, hit):
+    if metrics_available():
+        CACHE_LOOKUPS.labels(cache_name, "hit" if hit else "miss").inc()
+
+
+def observe_storage_call(backend, operation, seconds, failed):
+    if metrics_available():
+        STORAGE_LATENCY.labels(backend, operation).observe(seconds)
+        if failed:
+            STORAGE_ERRORS.labels(backend, operation).inc()
+
+
+def render_metrics():
+    """Prometheus text exposition, aggregated over all workers in multiprocess mode"""
+    if not metrics_available():
+        return Response("Metrics are disabled (install prometheus_client)\n", status=501, mimetype="text/plain")
+
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(prometheus_client.generate_latest(registry), content_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+def mark_worker_dead(pid):
+    """Call from gunicorn's child_exit hook so live gauges drop the exited worker"""
+    if prometheus_client is not None and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,100 @@
+import os
+import re
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy_utils import database_exists, create_database
+
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations')
+
+# Arbitrary key so only one migration runner touches the schema at a time
+MIGRATION_LOCK_ID = 181001
+
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+
+def discover_migrations():
+    """Return [(version, name, path)] for every migration file, in order"""
+    migrations = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    return sorted(migrations)
+
+
+def latest_version():
+    """Highest migration version shipped with the code"""
+    migrations = discover_migrations()
+    return migrations[-1][0] if migrations else 0
+
+
+def current_version(engine):
+    """Schema version recorded in the database, or 0 if it was never migrated"""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")).scalar()
+    except ProgrammingError:
+        return 0
+
+
+def ensure_database(database_url):
+    """Create the database itself if it does not exist yet"""
+    if not database_exists(database_url):
+        print("Database does not exist. Creating...")
+        create_database(database_url)
+        print("[OK] Database created!")
+
+
+def apply_migrations(engine):
+    """Apply pending migrations, each in its own transaction. Returns the versions applied."""
+    applied = []
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        try:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name VARCHAR(255) NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+            conn.commit()
+
+            done = {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+            conn.commit()
+
+            for version, name, path in discover_migrations():
+                if version in done:
+                    continue
+                with open(path) as f:
+                    sql = f.read()
+                print(f"Applying migration {version:04d}_{name}...")
+                conn.exec_driver_sql(sql)
+                conn.execute(
+                    text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                    {"version": version, "name": name}
+                )
+                conn.commit()
+                applied.append(version)
+        finally:
+            conn.rollback()
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+            conn.commit()
+    return applied
+
+
+def check_schema_version(engine):
+    """Cheap boot-time check: warn when the database is behind the code.
+    Returns None when the database cannot be reached."""
+    try:
+        current = current_version(engine)
+    except OperationalError as e:
+        print(f"[WARN] Could not check database schema version: {e}")
+        return None
+    latest = latest_version()
+    if current < latest:
+        print(f"[WARN] Database schema is at version {current}, code expects {latest}. Run 'flask --app app migrate'.")
+    else:
+        print(f"[OK] Database schema at version {current}")
+    return current
@@ -0,0 +1,85 @@
+import base64
+import json
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def normalize_sort(sort, sort_by, sortable_columns):
+    """Validate sort direction and column against a model's whitelist"""
+    sort = (sort or 'asc').lower()
+    if sort not in ('asc', 'desc'):
+        raise ValueError("sort must be 'asc' or 'desc'")
+    if sort_by not in sortable_columns:
+        raise ValueError(f"Cannot sort by '{sort_by}'")
+    return sort, sort_by
+
+
+def parse_limit(value):
+    """Parse the `limit` query parameter, clamped to MAX_PAGE_SIZE"""
+    if value is None or value == '':
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def encode_cursor(sort_by, sort, value, key):
+    """Build an opaque cursor pointing just after the given row"""
+    payload = json.dumps({"s": sort_by, "d": sort, "v": value, "k": key}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, sort_by, sort):
+    """Decode a cursor, rejecting tokens issued for a different ordering"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_sort_by, cursor_sort = payload["s"], payload["d"]
+        value, key = payload["v"], payload["k"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if cursor_sort_by != sort_by or cursor_sort != sort:
+        raise ValueError("Cursor does not match the requested sort order")
+    return value, key
+
+
+def keyset_condition(sort_by, key_col, sort, after, params):
+    """
+    Return the WHERE fragment that continues after the cursor row.
+    Ties on the sort column are broken by the unique key column.
+    """
+    value, key = decode_cursor(after, sort_by, sort)
+    op = '>' if sort == 'asc' else '<'
+    params["cursor_key"] = key
+    if sort_by == key_col:
+        return f"{key_col} {op} :cursor_key"
+    params["cursor_value"] = value
+    return f"({sort_by}, {key_col}) {op} (:cursor_value, :cursor_key)"
+
+
+def keyset_order(sort_by, key_col, sort):
+    """ORDER BY clause matching keyset_condition"""
+    if sort_by == key_col:
+        return f"{key_col} {sort.upper()}"
+    return f"{sort_by} {sort.upper()}, {key_col} {sort.upper()}"
+
+
+def build_page(items, limit, sort_by, sort, sort_field, key_field):
+    """
+    Trim a result fetched with limit + 1 rows and attach the next cursor.
+    `sort_field` / `key_field` are the response keys (or tuple positions) holding the cursor values.
+    """
+    has_more = len(items) > limit
+    items = items[:limit]
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        next_cursor = encode_cursor(sort_by, sort, last[sort_field], last[key_field])
+    return {"items": items, "nextCursor": next_cursor}
@@ -0,0 +1,105 @@
+import json
+import os
+import time
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+
+# Statements slower than this are written to the slow-query log (0 logs every statement, negative disables)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_MAX_CHARS = int(os.getenv("SLOW_QUERY_MAX_CHARS", "2000"))
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+
+
+def _compact(statement):
+    """Collapse whitespace so a statement fits on one log line"""
+    statement = " ".join(statement.split())
+    if len(statement) > SLOW_QUERY_MAX_CHARS:
+        statement = statement[:SLOW_QUERY_MAX_CHARS] + "..."
+    return statement
+
+
+def _statement_label(statement):
+    """Short header-safe label for a statement, e.g. 'SELECT students'"""
+    words = statement.split()
+    if not words:
+        return ""
+    verb = words[0].upper()
+    upper = [w.upper() for w in words]
+    for keyword in ("FROM", "INTO", "UPDATE"):
+        if keyword in upper[:-1]:
+            table = words[upper.index(keyword) + 1]
+            return f"{verb} {table}".replace('"', "")
+    return verb.replace('"', "")
+
+
+def _log_slow_query(elapsed_ms, statement, executemany):
+    entry = {
+        "event": "slow_query",
+        "ms": round(elapsed_ms, 2),
+        "thresholdMs": SLOW_QUERY_MS,
+        "executemany": executemany,
+        "statement": _compact(statement),
+    }
+    if has_request_context():
+        entry["method"] = request.method
+        entry["path"] = request.path
+        entry["endpoint"] = request.endpoint
+    # Parameters are left out on purpose: they carry student data
+    print(json.dumps(entry), flush=True)
+
+
+def _record(elapsed_ms, statement):
+    """Add one statement to the current request's totals"""
+    if not has_request_context() or "db_queries" not in g:
+        return
+    g.db_queries += 1
+    g.db_time_ms += elapsed_ms
+    if elapsed_ms > g.db_slowest_ms:
+        g.db_slowest_ms = elapsed_ms
+        g.db_slowest_statement = statement
+
+
+def instrument_engine(engine):
+    """Time every statement run through the engine (requests and background workers alike)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started_at = getattr(context, "_query_started_at", None)
+        if started_at is None:
+            return
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        _record(elapsed_ms, statement)
+        if 0 <= SLOW_QUERY_MS <= elapsed_ms:
+            _log_slow_query(elapsed_ms, statement, executemany)
+
+
+def init_request_timing(app):
+    """Reset counters per request and report them in a Server-Timing header"""
+
+    @app.before_request
+    def start_request_timing():
+        g.request_started_at = time.perf_counter()
+        g.db_queries = 0
+        g.db_time_ms = 0.0
+        g.db_slowest_ms = 0.0
+        g.db_slowest_statement = None
+
+    @app.after_request
+    def add_server_timing(response):
+        if not SERVER_TIMING_ENABLED or "request_started_at" not in g:
+            return response
+        # Streamed bodies run their queries after this point, so those are not included
+        total_ms = (time.perf_counter() - g.request_started_at) * 1000
+        metrics = [
+            f'db;dur={g.db_time_ms:.2f};desc="{g.db_queries} queries"',
+            f'db-slowest;dur={g.db_slowest_ms:.2f};desc="{_statement_label(g.db_slowest_statement or "")}"',
+            f"app;dur={max(total_ms - g.db_time_ms, 0):.2f}",
+            f"total;dur={total_ms:.2f}",
+        ]
+        response.headers.add("Server-Timing", ", ".join(metrics))
+        return response
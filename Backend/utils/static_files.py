@@ -0,0 +1,122 @@
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from flask import Response, request
+from werkzeug.wsgi import wrap_file
+from utils.compression import SIDECAR_SUFFIXES, negotiate_encoding
+
+
+# Content-hashed build files never change, so browsers may keep them for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Other build files (favicon, logos, manifest.json) are cached briefly
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "86400"))
+# index.html is revalidated on every load so a deploy is picked up at once
+INDEX_CACHE_CONTROL = os.getenv("STATIC_INDEX_CACHE_CONTROL", "no-cache")
+
+# CRA file names carry an 8+ hex digit content hash (main.67ee285e.css)
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.")
+
+
+class StaticFile:
+    """One file of the build (or one of its sidecars), described once at startup"""
+
+    __slots__ = ("path", "size", "mtime", "etag")
+
+    def __init__(self, path):
+        stat = os.stat(path)
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = int(stat.st_mtime)
+        with open(path, "rb") as f:
+            # Content-based, so every worker and every host agrees on it
+            self.etag = hashlib.sha1(f.read()).hexdigest()[:20]
+
+
+class StaticAsset:
+    __slots__ = ("file", "mimetype", "cache_control", "sidecars")
+
+    def __init__(self, file, mimetype, cache_control, sidecars):
+        self.file = file
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.sidecars = sidecars  # {"br": StaticFile, "gzip": StaticFile}
+
+
+class StaticIndex:
+    """
+    In-memory index of the React build: url path -> file, content type, cache
+    policy and precompressed sidecars. Built once at startup (restart after a
+    new build), so requests never touch the filesystem except to open the file.
+    """
+
+    def __init__(self, root, index_name="index.html"):
+        self.root = root
+        self.index_name = index_name
+        self.assets = {}
+        if os.path.isdir(root):
+            self._scan(self._hashed_paths())
+        print(f"[OK] Indexed {len(self.assets)} static file(s) from {root}")
+
+    def _hashed_paths(self):
+        """Url paths asset-manifest.json lists as build outputs (all content-hashed)"""
+        try:
+            with open(os.path.join(self.root, "asset-manifest.json")) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        return {path.lstrip("/") for path in manifest.get("files", {}).values()} - {self.index_name}
+
+    def _scan(self, hashed_paths):
+        sidecar_suffixes = tuple(SIDECAR_SUFFIXES.values())
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(sidecar_suffixes):
+                    continue
+                full_path = os.path.join(directory, filename)
+                url_path = os.path.relpath(full_path, self.root).replace(os.sep, "/")
+
+                if url_path == self.index_name:
+                    cache_control = INDEX_CACHE_CONTROL
+                elif url_path in hashed_paths or HASHED_NAME.search(filename):
+                    cache_control = IMMUTABLE_CACHE_CONTROL
+                else:
+                    cache_control = f"public, max-age={STATIC_MAX_AGE}"
+
+                sidecars = {
+                    encoding: StaticFile(full_path + suffix)
+                    for encoding, suffix in SIDECAR_SUFFIXES.items()
+                    if os.path.isfile(full_path + suffix)
+                }
+                mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                self.assets[url_path] = StaticAsset(StaticFile(full_path), mimetype, cache_control, sidecars)
+
+    def send(self, path):
+        """Response for a build file, or for index.html when path is not a file (React Router)"""
+        asset = self.assets.get(path) or self.assets.get(self.index_name)
+        if asset is None:
+            return {"error": "Frontend build not found"}, 404
+
+        encoding = negotiate_encoding(list(asset.sidecars)) if asset.sidecars else None
+        file = asset.sidecars[encoding] if encoding else asset.file
+
+        response = Response(mimetype=asset.mimetype)
+        response.set_etag(file.etag)
+        response.last_modified = file.mtime
+        response.headers["Cache-Control"] = asset.cache_control
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if asset.sidecars:
+            response.vary.add("Accept-Encoding")
+
+        # Answer revalidations before opening the file
+        if request.if_none_match.contains(file.etag):
+            response.status_code = 304
+            return response
+
+        # wsgi.file_wrapper lets the server use sendfile() where it supports it
+        response.response = wrap_file(request.environ, open(file.path, "rb"))
+        response.direct_passthrough = True
+        response.content_length = file.size
+        return response.make_conditional(request, accept_ranges=True, complete_length=file.size)
@@ -0,0 +1,174 @@
+import os
+import shutil
+import time
+from abc import ABC, abstractmethod
+from urllib.parse import unquote
+
+
+class StorageBackend(ABC):
+    """
+    Object storage used for avatar images. Paths are bucket-relative keys
+    such as 'students/2025-0001.png'. Implementations never stream object
+    bytes through the web process for move/copy/delete. Subclasses must
+    implement every abstract method or they cannot be instantiated.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def public_url(self, path):
+        raise NotImplementedError
+
+    def path_from_url(self, url):
+        """Inverse of public_url; None if the URL is not served by this backend"""
+        prefix = self.public_url("")
+        if not url or not url.startswith(prefix):
+            return None
+        path = url[len(prefix):].split('?', 1)[0].split('#', 1)[0]
+        return unquote(path) or None
+
+    @abstractmethod
+    def upload(self, path, data, content_type):
+        raise NotImplementedError
+
+    @abstractmethod
+    def download(self, path):
+        raise NotImplementedError
+
+    @abstractmethod
+    def move(self, src, dst):
+        raise NotImplementedError
+
+    @abstractmethod
+    def copy(self, src, dst):
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, paths):
+        raise NotImplementedError
+
+
+class LocalStorage(StorageBackend):
+    """Filesystem backend for tests and offline deployments (served by the app under /media)"""
+
+    name = "local"
+
+    def __init__(self, root, base_url):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip('/')
+
+    def _full_path(self, path):
+        full = os.path.abspath(os.path.join(self.root, path))
+        if not full.startswith(self.root + os.sep):
+            raise ValueError(f"Invalid storage path: {path}")
+        return full
+
+    def public_url(self, path):
+        return f"{self.base_url}/{path}"
+
+    def upload(self, path, data, content_type):
+        full = self._full_path(path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, 'wb') as f:
+            f.write(data)
+
+    def download(self, path):
+        with open(self._full_path(path), 'rb') as f:
+            return f.read()
+
+    def move(self, src, dst):
+        src_full, dst_full = self._full_path(src), self._full_path(dst)
+        if not os.path.exists(src_full) and os.path.exists(dst_full):
+            return  # already moved by an earlier attempt
+        os.makedirs(os.path.dirname(dst_full), exist_ok=True)
+        os.replace(src_full, dst_full)
+
+    def copy(self, src, dst):
+        dst_full = self._full_path(dst)
+        os.makedirs(os.path.dirname(dst_full), exist_ok=True)
+        shutil.copyfile(self._full_path(src), dst_full)
+
+    def delete(self, paths):
+        for path in paths:
+            try:
+                os.remove(self._full_path(path))
+            except FileNotFoundError:
+                pass
+
+
+class TimedStorage(StorageBackend):
+    """Wraps a backend and reports the latency of each network/disk call to the metrics module"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = backend.name
+
+    def _timed(self, operation, *args):
+        from utils.metrics import observe_storage_call
+
+        started_at = time.perf_counter()
+        failed = True
+        try:
+            result = getattr(self.backend, operation)(*args)
+            failed = False
+            return result
+        finally:
+            observe_storage_call(self.name, operation, time.perf_counter() - started_at, failed)
+
+    def public_url(self, path):
+        return self.backend.public_url(path)
+
+    def path_from_url(self, url):
+        return self.backend.path_from_url(url)
+
+    def upload(self, path, data, content_type):
+        return self._timed("upload", path, data, content_type)
+
+    def download(self, path):
+        return self._timed("download", path)
+
+    def move(self, src, dst):
+        return self._timed("move", src, dst)
+
+    def copy(self, src, dst):
+        return self._timed("copy", src, dst)
+
+    def delete(self, paths):
+        return self._timed("delete", paths)
+
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "").lower()
+LOCAL_STORAGE_ROOT = os.getenv("LOCAL_STORAGE_ROOT", os.path.join(os.path.dirname(os.path.dirname(__file__)), 'media'))
+LOCAL_STORAGE_URL = os.getenv("LOCAL_STORAGE_URL", "/media")
+
+_storage = None
+
+
+def get_storage():
+    """
+    Return the configured backend. STORAGE_BACKEND=supabase|local; when unset,
+    Supabase is used if it is configured and the local filesystem otherwise.
+    """
+    global _storage
+    if _storage is None:
+        from utils.supabase_client import SupabaseStorage, supabase
+
+        backend = STORAGE_BACKEND or ("supabase" if supabase else "local")
+        if backend == "supabase":
+            if not supabase:
+                raise RuntimeError("Supabase client not configured")
+            _storage = SupabaseStorage(supabase)
+        elif backend == "local":
+            _storage = LocalStorage(LOCAL_STORAGE_ROOT, LOCAL_STORAGE_URL)
+        else:
+            raise RuntimeError(f"Unknown STORAGE_BACKEND '{backend}'")
+        _storage = TimedStorage(_storage)
+    return _storage
+
+
+def object_path(url):
+    """Storage path behind a public URL, or None (also when no backend is usable)"""
+    try:
+        return get_storage().path_from_url(url)
+    except RuntimeError:
+        return None
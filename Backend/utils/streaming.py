@@ -0,0 +1,32 @@
+from flask import Response, stream_with_context
+from utils.serialization import dumps
+
+
+STREAM_FORMATS = ("ndjson", "json-stream")
+
+
+def _ndjson_chunks(batches):
+    for batch in batches:
+        yield b"".join(dumps(row) + b"\n" for row in batch)
+
+
+def _json_array_chunks(batches):
+    yield b"["
+    first = True
+    for batch in batches:
+        if not batch:
+            continue
+        chunk = b",".join(dumps(row) for row in batch)
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]"
+
+
+def stream_rows(batches, fmt):
+    """
+    Stream batches of row dicts as NDJSON (one object per line) or as a
+    single JSON array sent in chunks. Only one batch is held in memory.
+    """
+    if fmt == "ndjson":
+        return Response(stream_with_context(_ndjson_chunks(batches)), mimetype="application/x-ndjson")
+    return Response(stream_with_context(_json_array_chunks(batches)), mimetype="application/json")
@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+
+
+IMPORT_COLUMNS = ("student_id", "first_name", "last_name", "gender", "program_code", "year_level", "profile_image_url")
+REQUIRED_COLUMNS = IMPORT_COLUMNS[:-1]
+VALID_GENDERS = ("M", "F", "Others")
+MAX_LENGTHS = {"student_id": 20, "first_name": 100, "last_name": 100, "gender": 10, "program_code": 10}
+
+
+def detect_format(filename, content_type):
+    """Pick 'csv' or 'ndjson' from an upload's file name or content type"""
+    filename = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if filename.endswith((".jsonl", ".ndjson")) or "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    return "csv"
+
+
+def _read_records(stream, fmt):
+    """Yield (row_no, dict) pairs; row_no is 1-based over data rows"""
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "ndjson":
+        row_no = 0
+        for line in text_stream:
+            if not line.strip():
+                continue
+            row_no += 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield row_no, None
+                continue
+            yield row_no, record if isinstance(record, dict) else None
+    else:
+        reader = csv.DictReader(text_stream)
+        missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+        for row_no, record in enumerate(reader, start=1):
+            yield row_no, record
+
+
+def _validate(record):
+    """Return (row tuple, None) or (None, error message)"""
+    if record is None:
+        return None, "Row is not a valid JSON object"
+
+    values = {}
+    for column in IMPORT_COLUMNS:
+        value = record.get(column)
+        values[column] = str(value).strip() if value is not None else ""
+
+    missing = [c for c in REQUIRED_COLUMNS if not values[c]]
+    if missing:
+        return None, f"Missing required fields: {', '.join(missing)}"
+
+    for column, max_length in MAX_LENGTHS.items():
+        if len(values[column]) > max_length:
+            return None, f"{column} is longer than {max_length} characters"
+
+    if values["gender"] not in VALID_GENDERS:
+        return None, "gender must be one of M, F, Others"
+
+    try:
+        year_level = int(values["year_level"])
+    except ValueError:
+        return None, "year_level must be an integer"
+    if not 1 <= year_level <= 5:
+        return None, "year_level must be between 1 and 5"
+
+    return (
+        values["student_id"],
+        values["first_name"],
+        values["last_name"],
+        values["gender"],
+        values["program_code"],
+        year_level,
+        values["profile_image_url"] or None,
+    ), None
+
+
+def parse_student_rows(stream, fmt):
+    """
+    Parse and validate an uploaded CSV / NDJSON stream.
+    Returns (rows, errors) where rows are (row_no, *IMPORT_COLUMNS) tuples
+    and errors are {"row", "error"} dicts for rows rejected before the database.
+    """
+    rows = []
+    errors = []
+    for row_no, record in _read_records(stream, fmt):
+        row, error = _validate(record)
+        if error:
+            errors.append({"row": row_no, "error": error})
+        else:
+            rows.append((row_no,) + row)
+    return rows, errors
@@ -0,0 +1,97 @@
+import io
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from utils.storage import get_storage
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; uploads then fail with a clear error
+    Image = None
+
+
+THUMBNAIL_SIZES = (48, 128, 512)
+# (file extension, Pillow format, content type, save options); WebP first, JPEG as fallback
+THUMBNAIL_FORMATS = (
+    ("webp", "WEBP", "image/webp", {"quality": 80, "method": 4}),
+    ("jpg", "JPEG", "image/jpeg", {"quality": 85, "optimize": True, "progressive": True}),
+)
+LIST_THUMBNAIL_SIZE = int(os.getenv("LIST_THUMBNAIL_SIZE", "128"))
+if LIST_THUMBNAIL_SIZE not in THUMBNAIL_SIZES:
+    raise ValueError(f"LIST_THUMBNAIL_SIZE must be one of {', '.join(map(str, THUMBNAIL_SIZES))}")
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+THUMBNAIL_TIMEOUT = 60
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def thumbnails_available():
+    return Image is not None
+
+
+def render_variants(data):
+    """Resize one image into every size/format. Runs in a worker process."""
+    image = Image.open(io.BytesIO(data))
+    image = ImageOps.exif_transpose(image).convert("RGB")
+
+    variants = []
+    for size in THUMBNAIL_SIZES:
+        # Square crop from the centre, like the circular avatars in the UI
+        resized = ImageOps.fit(image, (size, size), Image.LANCZOS)
+        for ext, fmt, content_type, options in THUMBNAIL_FORMATS:
+            buffer = io.BytesIO()
+            resized.save(buffer, fmt, **options)
+            variants.append((f"{size}.{ext}", buffer.getvalue(), content_type))
+    return variants
+
+
+def _get_pool():
+    """
+    Process pool shared by the job threads. Workers are spawned, not forked:
+    this process runs threads and holds pooled DB sockets, and a forked child
+    would inherit both (and any lock another thread held at fork time).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=THUMBNAIL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def create_thumbnails(storage, data):
+    """
+    Render all variants of an image in the process pool and store them under a
+    fresh key prefix. The prefix does not contain the student ID, so ID
+    changes never have to move thumbnails. Returns the prefix.
+    """
+    if not thumbnails_available():
+        raise RuntimeError("Pillow is not installed; thumbnails are unavailable")
+
+    variants = _get_pool().submit(render_variants, data).result(timeout=THUMBNAIL_TIMEOUT)
+    key = f"students/thumbs/{uuid.uuid4().hex}"
+    for name, body, content_type in variants:
+        storage.upload(f"{key}/{name}", body, content_type)
+    return key
+
+
+def variant_paths(key):
+    """Every object path stored under a thumbnail key"""
+    return [f"{key}/{size}.{fmt[0]}" for size in THUMBNAIL_SIZES for fmt in THUMBNAIL_FORMATS]
+
+
+def thumbnail_path(key, size=LIST_THUMBNAIL_SIZE, ext="webp"):
+    """Path of one variant; list views use the WebP one with the JPEG as fallback"""
+    return f"{key}/{size}.{ext}"
+
+
+def thumbnail_url(key, size=LIST_THUMBNAIL_SIZE, ext="webp"):
+    """Public URL of a thumbnail variant, or None when there are no thumbnails"""
+    if not key:
+        return None
+    try:
+        return get_storage().public_url(thumbnail_path(key, size, ext))
+    except RuntimeError:
+        return None
@@ -283,14 +283,17 @@ function Students() {
               paginated.map((s) => (
                 <tr key={s.id}>
                   <td>
-                    <img 
-                      src={s.profileImage || "/user_icon.png"} 
-                      alt={`${s.firstName} ${s.lastName}`}
-                      className="student-profile-thumbnail"
-                      onError={(e) => {
-                        e.target.src = "/user_icon.png";
-                      }}
-                    />
+                    <picture>
+                      {s.thumbnail && <source srcSet={s.thumbnail} type="image/webp" />}
+                      <img 
+                        src={s.thumbnailJpeg || s.profileImage || "/user_icon.png"} 
+                        alt={`${s.firstName} ${s.lastName}`}
+                        className="student-profile-thumbnail"
+                        onError={(e) => {
+                          e.target.src = "/user_icon.png";
+                        }}
+                      />
+                    </picture>
                   </td>
                   <td>{s.id}</td>
                   <td>{s.firstName}</td>